@@ -0,0 +1,53 @@
+import argparse
+import asyncio
+
+from app.database import async_session_maker
+from app.models.services import CatalogService
+from app.utils.catalog_io import CATALOG_FORMATS, get_catalog_format, read_catalog_records
+
+
+async def import_catalog(path: str):
+    catalog_format = get_catalog_format(path)
+
+    with open(path, encoding="utf-8", newline="") as file:
+        async with async_session_maker() as session:
+            result = await CatalogService.service_import_catalog(session, read_catalog_records(file, catalog_format))
+
+    print(
+        f"Imported {path}: {result['categories']} categories added, "
+        f"{result['inserted']} products added, {result['updated']} products updated"
+    )
+
+
+async def export_catalog(path: str, catalog_format: str | None):
+    catalog_format = catalog_format or get_catalog_format(path)
+
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        async with async_session_maker() as session:
+            async for chunk in CatalogService.service_export_catalog(session, catalog_format):
+                file.write(chunk)
+
+    print(f"Exported catalog to {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import or export the products catalog")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="Merge products and categories from a CSV or JSONL file")
+    import_parser.add_argument("path")
+
+    export_parser = subparsers.add_parser("export", help="Export products and categories to a CSV or JSONL file")
+    export_parser.add_argument("path")
+    export_parser.add_argument("--format", choices=CATALOG_FORMATS)
+
+    args = parser.parse_args()
+
+    if args.command == "import":
+        asyncio.run(import_catalog(args.path))
+    else:
+        asyncio.run(export_catalog(args.path, args.format))
+
+
+if __name__ == "__main__":
+    main()
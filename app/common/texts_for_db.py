@@ -1,6 +1,8 @@
 from aiogram.utils.formatting import Bold, as_list, as_marked_section
 
 
+SEED_VERSION = 2
+
 categories = ["Еда", "Напитки"]
 
 description_for_info_pages = {
@@ -1,14 +1,57 @@
+from typing import Literal
+
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
     TOKEN: str
+    TELEGRAM_API_URL: str | None = None
+
+    MODE: Literal["polling", "webhook"] = "polling"
+    WEBHOOK_URL: str | None = None
+    WEBHOOK_PATH: str = "/webhook"
+    WEBHOOK_SECRET: str | None = None
+    WEBHOOK_HOST: str = "0.0.0.0"
+    WEBHOOK_PORT: int = 8080
+    WEBHOOK_MAX_CONCURRENCY: int = 100
+
+    WORKERS: int = 1
+    WORKER_STATS_INTERVAL: float = 10
+    WORKER_DRAIN_TIMEOUT: float = 30
+
+    UPDATES_MAX_CONCURRENCY: int | None = None
+    UPDATES_MAX_PENDING: int = 1000
+    SLOW_UPDATE_THRESHOLD: float = 1.0
+
+    OUTBOUND_GLOBAL_RATE: float = 30
+    OUTBOUND_PRIVATE_CHAT_RATE: float = 1
+    OUTBOUND_GROUP_CHAT_RATE: float = 20 / 60
+    OUTBOUND_MAX_RETRIES: int = 3
 
     DB_HOST: str
     DB_PORT: int
     DB_USER: str
     DB_PASS: str
     DB_NAME: str
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    DB_COMMAND_TIMEOUT: float | None = None
+    DB_STATEMENT_CACHE_SIZE: int = 100
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 100
+
+    CART_WRITE_BEHIND: bool = False
+    CART_FLUSH_INTERVAL: float = 1.0
+
+    FSM_FLUSH_INTERVAL: float = 1.0
+
+    PROFILES_FLUSH_INTERVAL: float = 5.0
+
+    SCREEN_CACHE_TTL: float = 300
+
+    MODERATION_RELOAD_INTERVAL: float = 60
 
     @property
     def DATABASE_URL(self):
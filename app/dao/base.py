@@ -1,24 +1,109 @@
-from sqlalchemy import select
+from typing import AsyncIterator
+
+from sqlalchemy import select, bindparam, update, delete, func
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
 
 class BaseDAO:
     model = None
 
+    _statements = {}
+
+    @classmethod
+    def get_select_statement(cls, filter_by: dict, limit: int | None = None):
+        if None in filter_by.values():
+            return select(cls.model).filter_by(**filter_by).limit(limit), {}
+
+        key = (cls.model, tuple(sorted(filter_by)), limit)
+        statement = BaseDAO._statements.get(key)
+
+        if statement is None:
+            statement = select(cls.model).where(
+                *(getattr(cls.model, name) == bindparam(f"filter_{name}") for name in key[1])
+            ).limit(limit)
+            BaseDAO._statements[key] = statement
+
+        return statement, {f"filter_{name}": value for name, value in filter_by.items()}
+
     @classmethod
     async def get_all(cls, session: AsyncSession, **filter_by):
-        query = select(cls.model).filter_by(**filter_by)
-        result = await session.execute(query)
+        query, params = cls.get_select_statement(filter_by)
+        result = await session.execute(query, params)
         return result.scalars().all()
 
     @classmethod
     async def get_one(cls, session: AsyncSession, **filter_by):
-        query = select(cls.model).filter_by(**filter_by)
-        result = await session.execute(query)
+        query, params = cls.get_select_statement(filter_by)
+        result = await session.execute(query, params)
         return result.scalars().one_or_none()
 
     @classmethod
     async def get_first(cls, session: AsyncSession):
-        query = select(cls.model)
-        result = await session.execute(query)
+        query, params = cls.get_select_statement({}, limit=1)
+        result = await session.execute(query, params)
         return result.scalars().first()
+
+    @classmethod
+    async def get_many(cls, session: AsyncSession, ids):
+        key = (cls.model, "ids")
+        query = BaseDAO._statements.get(key)
+
+        if query is None:
+            query = select(cls.model).where(cls.model.id.in_(bindparam("ids", expanding=True)))
+            BaseDAO._statements[key] = query
+
+        result = await session.execute(query, {"ids": list(ids)})
+        return result.scalars().all()
+
+    @classmethod
+    async def stream_batches(cls, session: AsyncSession, batch_size: int = 1000, **filter_by) -> AsyncIterator[list]:
+        query, params = cls.get_select_statement(filter_by)
+        result = await session.stream_scalars(query, params, execution_options={"yield_per": batch_size})
+
+        async for batch in result.partitions():
+            yield batch
+
+    @classmethod
+    async def stream(cls, session: AsyncSession, batch_size: int = 1000, **filter_by) -> AsyncIterator:
+        async for batch in cls.stream_batches(session, batch_size, **filter_by):
+            for row in batch:
+                yield row
+
+    @classmethod
+    async def add_many(cls, session: AsyncSession, rows: list[dict]):
+        if rows:
+            await session.execute(insert(cls.model), rows)
+
+    @classmethod
+    async def upsert_many(cls, session: AsyncSession, rows: list[dict], index_elements: list[str]):
+        if not rows:
+            return
+
+        query = insert(cls.model)
+        query = query.on_conflict_do_update(
+            index_elements=index_elements,
+            set_={
+                **{name: query.excluded[name] for name in rows[0] if name not in index_elements},
+                "updated_at": func.now()
+            }
+        )
+        await session.execute(query, rows)
+
+    @classmethod
+    async def update_many(cls, session: AsyncSession, values: dict, **filter_by) -> int:
+        if not filter_by:
+            raise ValueError(f"{cls.__name__}.update_many requires at least one filter")
+
+        query = update(cls.model).filter_by(**filter_by).values(**values).execution_options(synchronize_session=False)
+        result = await session.execute(query)
+        return result.rowcount
+
+    @classmethod
+    async def delete_many(cls, session: AsyncSession, **filter_by) -> int:
+        if not filter_by:
+            raise ValueError(f"{cls.__name__}.delete_many requires at least one filter")
+
+        query = delete(cls.model).filter_by(**filter_by).execution_options(synchronize_session=False)
+        result = await session.execute(query)
+        return result.rowcount
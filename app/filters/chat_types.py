@@ -1,6 +1,8 @@
 from aiogram import Bot
 from aiogram.filters import Filter
-from aiogram.types import Message
+from aiogram.types import Message, CallbackQuery
+
+from app.models.services import AdminService
 
 
 class ChatTypeFilter(Filter):
@@ -15,5 +17,7 @@ class IsAdmin(Filter):
     def __init__(self) -> None:
         pass
 
-    async def __call__(self, message: Message, bot: Bot) -> bool:
-        return message.from_user.id in bot.my_admins_list
+    async def __call__(self, event: Message | CallbackQuery, bot: Bot) -> bool:
+        AdminService.service_refresh_stale(bot)
+
+        return AdminService.service_is_admin(event.from_user.id)
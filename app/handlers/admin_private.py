@@ -1,17 +1,26 @@
+import io
+import tempfile
+
 from aiogram import Router, F
-from aiogram.types import Message, ReplyKeyboardRemove, CallbackQuery
-from aiogram.filters import Command, or_f
+from aiogram.types import Message, ReplyKeyboardRemove, CallbackQuery, InputMediaPhoto, FSInputFile
+from aiogram.filters import Command, CommandObject, StateFilter, or_f
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.fsm.context import FSMContext
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.database import engine
 from app.filters.chat_types import ChatTypeFilter, IsAdmin
-from app.keyboards.inline import get_callback_btns
+from app.handlers.menu_processing_service import MenuProcessingService
+from app.keyboards.inline import get_callback_btns, get_admin_products_btns, AdminProductsCallback, keyboards_cache_info
 from app.keyboards.reply import get_reply_keyboard
-from app.models.services import ProductService, CategoryService, BannerService
+from app.middlewares.outbound import outbound_priority, BULK
+from app.middlewares.tracing import tracer
+from app.models.services import ProductService, CategoryService, BannerService, CatalogService
+from app.utils.catalog_io import CATALOG_FORMATS, get_catalog_format, read_catalog_records
 
 admin_router = Router()
 admin_router.message.filter(ChatTypeFilter(["private"]), IsAdmin())
+admin_router.callback_query.filter(IsAdmin())
 
 
 ADMIN_KB = get_reply_keyboard(
@@ -28,6 +37,100 @@ async def admin_features(message: Message):
     await message.answer("Что хотите сделать?", reply_markup=ADMIN_KB)
 
 
+def get_stats_scope(worker: str | None) -> str:
+    if worker is None:
+        return ""
+
+    return f"<i>Только воркер {worker}, остальные воркеры считают отдельно</i>\n"
+
+
+@admin_router.message(Command("pool"))
+async def pool_stats(message: Message, worker: str | None = None):
+    stats = engine.pool.stats()
+    checkout_time = stats["checkout_time"]
+    histogram = "\n".join(f"  {bucket}: {count}" for bucket, count in checkout_time["histogram"].items())
+
+    await message.answer(
+        f"{get_stats_scope(worker)}"
+        f"Размер пула: {stats['size']}, переполнение: {stats['overflow']}\n"
+        f"Занято: {stats['checked_out']}, свободно: {stats['checked_in']}, ожидают: {stats['waiting']}\n"
+        f"Выдач: {stats['checkouts']}, таймаутов: {stats['timeouts']}\n"
+        f"Время выдачи: среднее {checkout_time['avg'] * 1000:.2f} мс, максимум {checkout_time['max'] * 1000:.2f} мс\n"
+        f"Гистограмма (с):\n{histogram}"
+    )
+
+
+@admin_router.message(Command("stats"))
+async def handlers_stats(message: Message, worker: str | None = None):
+    stats = sorted(tracer.handler_stats().items(), key=lambda item: item[1]["count"], reverse=True)
+
+    if not stats:
+        await message.answer(f"{get_stats_scope(worker)}Статистики пока нет")
+        return
+
+    lines = [
+        f"<b>{name}</b>: {item['count']} шт., "
+        f"p50 {item['p50'] * 1000:.0f} / p95 {item['p95'] * 1000:.0f} / p99 {item['p99'] * 1000:.0f} мс, "
+        f"очередь {item['queue_wait'] * 1000:.0f} мс, "
+        f"БД {item['db_time'] * 1000:.0f} мс ({item['db_queries']:.1f} запр.), "
+        f"API {item['api_time'] * 1000:.0f} мс ({item['api_calls']:.1f} выз.)"
+        for name, item in stats
+    ]
+
+    banners = BannerService.service_cache_stats()
+    lines.append(f"Кэш баннеров: попаданий {banners['hits']}, промахов {banners['misses']}")
+    lines.extend(
+        f"Кэш клавиатуры {name}: попаданий {info['hits']}, промахов {info['misses']}, "
+        f"размер {info['currsize']}/{info['maxsize']}"
+        for name, info in keyboards_cache_info().items()
+    )
+
+    await message.answer(get_stats_scope(worker) + "\n".join(lines))
+
+
+@admin_router.message(StateFilter(None), F.document)
+async def import_catalog(message: Message, session: AsyncSession):
+    try:
+        catalog_format = get_catalog_format(message.document.file_name)
+    except ValueError:
+        await message.answer(f"Для импорта каталога отправьте файл: {', '.join(CATALOG_FORMATS)}")
+        return
+
+    with tempfile.TemporaryFile() as file:
+        await message.bot.download(message.document, destination=file)
+        lines = io.TextIOWrapper(file, encoding="utf-8", newline="")
+
+        try:
+            result = await CatalogService.service_import_catalog(session, read_catalog_records(lines, catalog_format))
+        except Exception as e:
+            await message.answer(f"Ошибка импорта: \n{str(e)}")
+            return
+
+    await message.answer(
+        f"Каталог импортирован\n"
+        f"Новых категорий: {result['categories']}\n"
+        f"Новых товаров: {result['inserted']}, обновлено: {result['updated']}"
+    )
+
+
+@admin_router.message(Command("export"))
+async def export_catalog(message: Message, command: CommandObject, session: AsyncSession):
+    catalog_format = (command.args or "csv").strip().lower()
+
+    if catalog_format not in CATALOG_FORMATS:
+        await message.answer(f"Формат экспорта: {', '.join(CATALOG_FORMATS)}")
+        return
+
+    with tempfile.NamedTemporaryFile("w", encoding="utf-8", newline="", suffix=f".{catalog_format}") as file:
+        async for chunk in CatalogService.service_export_catalog(session, catalog_format):
+            file.write(chunk)
+
+        file.flush()
+
+        with outbound_priority(BULK):
+            await message.answer_document(FSInputFile(file.name, filename=f"catalog.{catalog_format}"))
+
+
 @admin_router.message(F.text == "Ассортимент")
 async def assortment_of_categories(message: Message, session: AsyncSession):
     categories = await CategoryService.service_get_categories(session)
@@ -35,26 +138,85 @@ async def assortment_of_categories(message: Message, session: AsyncSession):
     await message.answer("Выберите категорию", reply_markup=get_callback_btns(btns=btns))
 
 
+MEDIA_GROUP_SIZE = 10
+
+
+def get_product_caption(product) -> str:
+    return f"<strong>{product.name}</strong>\n{product.description}\nСтоимость: {round(product.price, 2)}"
+
+
+async def get_products_page(session: AsyncSession, category_id: int, page: int):
+    paginator = await ProductService.service_get_products_page(session, category_id, page)
+
+    if not paginator.len:
+        return None, None
+
+    product = paginator.get_page()[0]
+    image = InputMediaPhoto(
+        media=product.image,
+        caption=f"{get_product_caption(product)}\n\n<strong>Товар {paginator.page} из {paginator.pages}</strong>"
+    )
+    kbds = get_admin_products_btns(
+        category=category_id,
+        page=paginator.page,
+        pagination_btns=MenuProcessingService.pages(paginator),
+        product_id=product.id
+    )
+
+    return image, kbds
+
+
 @admin_router.callback_query(F.data.startswith("category_"))
 async def get_product_by_category(callback: CallbackQuery, session: AsyncSession):
     category_id = callback.data.split("_")[-1]
 
-    products = await ProductService.service_get_all_products(session, int(category_id))
-
-    for product in products:
-        await callback.message.answer_photo(
-            product.image,
-            caption=f"<strong>{product.name}</strong>\n{product.description}\nСтоимость: {round(product.price, 2)}",
-            reply_markup=get_callback_btns(
-                btns={
-                    "Удалить": f"delete_{product.id}",
-                    "Изменить": f"change_{product.id}"
-                }
-            )
-        )
+    image, kbds = await get_products_page(session, int(category_id), page=1)
+
+    await callback.answer()
+
+    if image is None:
+        await callback.message.answer("В этой категории пока нет товаров")
+        return
+
+    await callback.message.answer_photo(image.media, caption=image.caption, reply_markup=kbds)
+
+
+@admin_router.callback_query(AdminProductsCallback.filter(F.action == "page"))
+async def products_page(callback: CallbackQuery, callback_data: AdminProductsCallback, session: AsyncSession):
+    image, kbds = await get_products_page(session, callback_data.category, callback_data.page)
+
+    if image is None:
+        await callback.answer("В этой категории больше нет товаров")
+        return
 
+    await callback.message.edit_media(media=image, reply_markup=kbds)
     await callback.answer()
-    await callback.message.answer("OK, вот список товаров ⤴")
+
+
+@admin_router.callback_query(AdminProductsCallback.filter(F.action == "overview"))
+async def products_overview(callback: CallbackQuery, callback_data: AdminProductsCallback, session: AsyncSession):
+    await callback.answer()
+
+    page = 1
+
+    with outbound_priority(BULK):
+        while True:
+            paginator = await ProductService.service_get_products_page(
+                session, callback_data.category, page, per_page=MEDIA_GROUP_SIZE
+            )
+
+            if not paginator.len:
+                break
+
+            await callback.message.answer_media_group([
+                InputMediaPhoto(media=product.image, caption=get_product_caption(product))
+                for product in paginator.get_page()
+            ])
+
+            if not paginator.has_next():
+                break
+
+            page += 1
 
 
 @admin_router.callback_query(F.data.startswith("delete_"))
@@ -116,8 +278,6 @@ class AddProduct(StatesGroup):
     price = State()
     image = State()
 
-    product_for_change = None
-
     texts = {
         "AddProduct:name": "Введите название заново",
         "AddProduct:description": "Введите описание заново",
@@ -127,13 +287,16 @@ class AddProduct(StatesGroup):
     }
 
 
+async def get_product_for_change(state: FSMContext, session: AsyncSession):
+    data = await state.get_data()
+    return await ProductService.service_get_one_product(session, data["product_for_change"])
+
+
 @admin_router.callback_query(F.data.startswith("change_"))
 async def change_product(callback: CallbackQuery, state: FSMContext, session: AsyncSession):
     product_id = callback.data.split("_")[-1]
 
-    product_for_change = await ProductService.service_get_one_product(session, int(product_id))
-
-    AddProduct.product_for_change = product_for_change
+    await state.set_data({"product_for_change": int(product_id)})
     await callback.answer()
     await callback.message.answer("Введите название товара", reply_markup=ReplyKeyboardRemove())
 
@@ -142,6 +305,7 @@ async def change_product(callback: CallbackQuery, state: FSMContext, session: As
 
 @admin_router.message(F.text == "Добавить товар")
 async def add_product(message: Message, state: FSMContext):
+    await state.set_data({})
     await message.answer("Введите название товара", reply_markup=ReplyKeyboardRemove())
     await state.set_state(AddProduct.name)
 
@@ -153,9 +317,6 @@ async def cancel_handler(message: Message, state: FSMContext) -> None:
     if current_state is None:
         return
 
-    if AddProduct.product_for_change:
-        AddProduct.product_for_change = None
-
     await state.clear()
     await message.answer("Действия отменены", reply_markup=ADMIN_KB)
 
@@ -179,9 +340,10 @@ async def back_handler(message: Message, state: FSMContext) -> None:
 
 
 @admin_router.message(AddProduct.name, or_f(F.text, F.text == "."))
-async def add_name(message: Message, state: FSMContext):
+async def add_name(message: Message, state: FSMContext, session: AsyncSession):
     if message.text == ".":
-        await state.update_data(name=AddProduct.product_for_change.name)
+        product_for_change = await get_product_for_change(state, session)
+        await state.update_data(name=product_for_change.name)
     else:
         if len(message.text) >= 100:
             await message.answer("Название товара не должно превышать 100 символов. \n Введите заново")
@@ -201,7 +363,8 @@ async def incorrect_add_name(message: Message):
 @admin_router.message(AddProduct.description, or_f(F.text, F.text == "."))
 async def add_description(message: Message, state: FSMContext, session: AsyncSession):
     if message.text == ".":
-        await state.update_data(description=AddProduct.product_for_change.description)
+        product_for_change = await get_product_for_change(state, session)
+        await state.update_data(description=product_for_change.description)
     else:
         await state.update_data(description=message.text)
 
@@ -238,9 +401,10 @@ async def incorrect_category_choice(message: Message):
 
 
 @admin_router.message(AddProduct.price, or_f(F.text, F.text == "."))
-async def add_price(message: Message, state: FSMContext):
+async def add_price(message: Message, state: FSMContext, session: AsyncSession):
     if message.text == ".":
-        await state.update_data(price=AddProduct.product_for_change.price)
+        product_for_change = await get_product_for_change(state, session)
+        await state.update_data(price=str(product_for_change.price))
     else:
         try:
             float(message.text)
@@ -262,16 +426,18 @@ async def incorrect_add_price(message: Message):
 @admin_router.message(AddProduct.image, or_f(F.photo, F.text == "."))
 async def add_image(message: Message, state: FSMContext, session: AsyncSession):
     if message.text == ".":
-        await state.update_data(image=AddProduct.product_for_change.image)
+        product_for_change = await get_product_for_change(state, session)
+        await state.update_data(image=product_for_change.image)
     else:
         image = message.photo[-1].file_id
         await state.update_data(image=image)
 
     data = await state.get_data()
+    product_id = data.pop("product_for_change", None)
 
     try:
-        if AddProduct.product_for_change:
-            await ProductService.service_update_product(session, AddProduct.product_for_change.id, data)
+        if product_id:
+            await ProductService.service_update_product(session, product_id, data)
         else:
             await ProductService.service_add_product(session, data)
 
@@ -283,8 +449,6 @@ async def add_image(message: Message, state: FSMContext, session: AsyncSession):
         )
         await state.clear()
 
-    AddProduct.product_for_change = None
-
 
 @admin_router.message(AddProduct.image)
 async def incorrect_add_image(message: Message):
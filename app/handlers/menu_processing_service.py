@@ -1,12 +1,18 @@
 from aiogram.types import InputMediaPhoto
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.keyboards.inline import get_user_main_btns, get_user_catalog_btns, get_products_btns, get_user_cart
-from app.models.services import CartService, BannerService, ProductService, CategoryService
+from app.keyboards.inline import (
+    get_user_main_btns, get_user_catalog_btns, get_products_btns, get_user_cart, clear_keyboards_cache
+)
+from app.config import settings
+from app.models.services import CartService, BannerService, CatalogService
+from app.utils.cache import TTLCache
 from app.utils.paginator import Paginator
 
 
 class MenuProcessingService:
+    screens = TTLCache(maxsize=1024, ttl=settings.SCREEN_CACHE_TTL)
+
     @staticmethod
     async def main_menu(session: AsyncSession, level: int, menu_name: str):
         banner = await BannerService.service_get_banner(session, menu_name)
@@ -20,8 +26,8 @@ class MenuProcessingService:
     async def catalog(session: AsyncSession, level: int, menu_name: str):
         banner = await BannerService.service_get_banner(session, menu_name)
         image = InputMediaPhoto(media=banner.image, caption=banner.description)
-        categories = await CategoryService.service_get_categories(session)
-        kbds = get_user_catalog_btns(level=level, categories=categories)
+        catalog = await CatalogService.service_get_catalog(session)
+        kbds = get_user_catalog_btns(level=level, categories=catalog.categories)
 
         return image, kbds
 
@@ -39,7 +45,8 @@ class MenuProcessingService:
 
     @classmethod
     async def products(cls, session: AsyncSession, level: int, category: int, page: int):
-        products = await ProductService.service_get_all_products(session, category)
+        catalog = await CatalogService.service_get_catalog(session)
+        products = catalog.get_products(category)
 
         paginator = Paginator(products, page=page)
         product = paginator.get_page()[0]
@@ -81,9 +88,9 @@ class MenuProcessingService:
         elif menu_name == "increment":
             await CartService.service_add_to_cart(session, user_id, product_id)
 
-        carts = await CartService.service_get_user_carts(session, user_id)
+        paginator = await CartService.service_get_cart_summary(session, user_id, page)
 
-        if not carts:
+        if not paginator.len:
             banner = await BannerService.service_get_banner(session, "cart")
             image = InputMediaPhoto(
                 media=banner.image, caption=f"<strong>{banner.description}</strong>"
@@ -96,12 +103,10 @@ class MenuProcessingService:
                 product_id=None
             )
         else:
-            paginator = Paginator(carts, page=page)
-
             cart = paginator.get_page()[0]
 
             cart_price = round(cart.quantity * cart.product.price, 2)
-            total_price = round(sum(cart.quantity * cart.product.price for cart in carts), 2)
+            total_price = round(paginator.aggregates["total_price"], 2)
             image = InputMediaPhoto(
                 media=cart.product.image,
                 caption=f"""
@@ -115,7 +120,7 @@ class MenuProcessingService:
 
             kbds = get_user_cart(
                 level=level,
-                page=page,
+                page=paginator.page,
                 pagination_btns=pagination_btns,
                 product_id=cart.product.id
             )
@@ -133,11 +138,29 @@ class MenuProcessingService:
             product_id: int | None = None,
             user_id: int | None = None
     ):
+        if level == 3:
+            return await cls.carts(session, level, menu_name, page, user_id, product_id)
+
+        screen_key = (level, menu_name) if level < 2 else (level, category, page)
+        screen = cls.screens.get(screen_key)
+
+        if screen is not None:
+            return screen
+
         if level == 0:
-            return await cls.main_menu(session, level, menu_name)
+            screen = await cls.main_menu(session, level, menu_name)
         elif level == 1:
-            return await cls.catalog(session, level, menu_name)
+            screen = await cls.catalog(session, level, menu_name)
         elif level == 2:
-            return await cls.products(session, level, category, page)
-        elif level == 3:
-            return await cls.carts(session, level, menu_name, page, user_id, product_id)
+            screen = await cls.products(session, level, category, page)
+        else:
+            return None
+
+        cls.screens.set(screen_key, screen)
+
+        return screen
+
+
+CatalogService.service_add_invalidation_hook(clear_keyboards_cache)
+CatalogService.service_add_invalidation_hook(MenuProcessingService.screens.clear)
+BannerService.service_add_invalidation_hook(MenuProcessingService.screens.clear)
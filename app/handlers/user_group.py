@@ -1,11 +1,9 @@
-from string import punctuation
-
 from aiogram import Router, Bot
 from aiogram.filters import Command
 from aiogram.types import Message
 
-from app.common.restricted_words import restricted_words
 from app.filters.chat_types import ChatTypeFilter
+from app.models.services import ModerationService, AdminService
 
 user_group_router = Router()
 user_group_router.message.filter(ChatTypeFilter(["group", "supergroup"]))
@@ -15,25 +13,16 @@ user_group_router.edited_message.filter(ChatTypeFilter(["group", "supergroup"]))
 @user_group_router.message(Command("admin"))
 async def get_admins(message: Message, bot: Bot):
     chat_id = message.chat.id
-    admins_list = await bot.get_chat_administrators(chat_id)
-
-    admins_list = [
-        member.user.id for member in admins_list if member.status == "creator" or member.status == "administrator"
-    ]
 
-    bot.my_admins_list = admins_list
+    await AdminService.service_refresh_chat(bot, chat_id)
 
-    if message.from_user.id in admins_list:
+    if AdminService.service_is_admin(message.from_user.id, chat_id):
         await message.delete()
 
 
-def clean_text(text: str) -> str:
-    return text.translate(str.maketrans("", "", punctuation))
-
-
 @user_group_router.edited_message()
 @user_group_router.message()
 async def cleaner(message: Message):
-    if restricted_words.intersection(clean_text(message.text.lower()).split()):
+    if ModerationService.service_find_restricted_word(message.text or message.caption):
         await message.answer(f"{message.from_user.first_name}, соблюдайте порядок в чате!")
         await message.delete()
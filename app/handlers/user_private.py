@@ -42,6 +42,10 @@ async def user_menu(callback: CallbackQuery, callback_data: MenuCallback, sessio
         await add_to_cart(callback, callback_data, session)
         return
 
+    if callback_data.menu_name == "order" and not await CartService.service_checkout(callback.from_user.id):
+        await callback.answer("Не удалось оформить заказ, попробуйте ещё раз", show_alert=True)
+        return
+
     media, reply_markup = await MenuProcessingService.get_menu_content(
         session,
         level=callback_data.level,
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 from aiogram.filters.callback_data import CallbackData
 from aiogram.utils.keyboard import InlineKeyboardBuilder
 from aiogram.types import InlineKeyboardButton
@@ -11,6 +13,16 @@ class MenuCallback(CallbackData, prefix="menu"):
     product_id: int | None = None
 
 
+class AdminProductsCallback(CallbackData, prefix="admin_products"):
+    action: str
+    category: int
+    page: int = 1
+
+
+KEYBOARDS_CACHE_SIZE = 1024
+
+
+@lru_cache(maxsize=KEYBOARDS_CACHE_SIZE)
 def get_user_main_btns(*, level: int, sizes: tuple[int] = (2,)):
     keyboard = InlineKeyboardBuilder()
 
@@ -40,6 +52,13 @@ def get_user_main_btns(*, level: int, sizes: tuple[int] = (2,)):
 
 
 def get_user_catalog_btns(*, level: int, categories: list, sizes: tuple[int] = (2,)):
+    return _get_user_catalog_btns(
+        level=level, categories=tuple((category.id, category.name) for category in categories), sizes=sizes
+    )
+
+
+@lru_cache(maxsize=KEYBOARDS_CACHE_SIZE)
+def _get_user_catalog_btns(*, level: int, categories: tuple[tuple[int, str], ...], sizes: tuple[int]):
     keyboard = InlineKeyboardBuilder()
 
     keyboard.add(InlineKeyboardButton(
@@ -49,10 +68,10 @@ def get_user_catalog_btns(*, level: int, categories: list, sizes: tuple[int] = (
         text="Корзина 🧺", callback_data=MenuCallback(level=3, menu_name="cart").pack()
     ))
 
-    for category in categories:
+    for category_id, category_name in categories:
         keyboard.add(InlineKeyboardButton(
-            text=category.name, callback_data=MenuCallback(
-                level=level + 1, menu_name=category.name, category=category.id
+            text=category_name, callback_data=MenuCallback(
+                level=level + 1, menu_name=category_name, category=category_id
             ).pack()
         ))
 
@@ -67,6 +86,26 @@ def get_products_btns(
         pagination_btns: dict,
         product_id: int,
         sizes: tuple[int] = (2, 1)
+):
+    return _get_products_btns(
+        level=level,
+        category=category,
+        page=page,
+        pagination_btns=tuple(pagination_btns.items()),
+        product_id=product_id,
+        sizes=sizes
+    )
+
+
+@lru_cache(maxsize=KEYBOARDS_CACHE_SIZE)
+def _get_products_btns(
+        *,
+        level: int,
+        category: int,
+        page: int,
+        pagination_btns: tuple[tuple[str, str], ...],
+        product_id: int,
+        sizes: tuple[int]
 ):
     keyboard = InlineKeyboardBuilder()
 
@@ -86,7 +125,7 @@ def get_products_btns(
 
     row = []
 
-    for text, menu_name in pagination_btns.items():
+    for text, menu_name in pagination_btns:
         if menu_name == "next":
             row.append(InlineKeyboardButton(
                 text=text,
@@ -108,6 +147,24 @@ def get_user_cart(
         pagination_btns: dict | None,
         product_id: int | None,
         sizes: tuple[int] = (3,)
+):
+    return _get_user_cart(
+        level=level,
+        page=page,
+        pagination_btns=tuple((pagination_btns or {}).items()),
+        product_id=product_id,
+        sizes=sizes
+    )
+
+
+@lru_cache(maxsize=KEYBOARDS_CACHE_SIZE)
+def _get_user_cart(
+        *,
+        level: int,
+        page: int | None,
+        pagination_btns: tuple[tuple[str, str], ...],
+        product_id: int | None,
+        sizes: tuple[int]
 ):
     keyboard = InlineKeyboardBuilder()
 
@@ -132,7 +189,7 @@ def get_user_cart(
 
         row = []
 
-        for text, menu_name in pagination_btns.items():
+        for text, menu_name in pagination_btns:
             if menu_name == "next":
                 row.append(InlineKeyboardButton(
                     text=text,
@@ -160,6 +217,56 @@ def get_user_cart(
         return keyboard.adjust(*sizes).as_markup()
 
 
+def get_admin_products_btns(
+        *,
+        category: int,
+        page: int,
+        pagination_btns: dict,
+        product_id: int,
+        sizes: tuple[int] = (2,)
+):
+    keyboard = InlineKeyboardBuilder()
+
+    keyboard.add(InlineKeyboardButton(text="Удалить", callback_data=f"delete_{product_id}"))
+    keyboard.add(InlineKeyboardButton(text="Изменить", callback_data=f"change_{product_id}"))
+
+    keyboard.adjust(*sizes)
+
+    row = []
+
+    for text, menu_name in pagination_btns.items():
+        if menu_name == "next":
+            row.append(InlineKeyboardButton(
+                text=text,
+                callback_data=AdminProductsCallback(action="page", category=category, page=page + 1).pack()
+            ))
+        elif menu_name == "previous":
+            row.append(InlineKeyboardButton(
+                text=text,
+                callback_data=AdminProductsCallback(action="page", category=category, page=page - 1).pack()
+            ))
+
+    keyboard.row(*row)
+
+    keyboard.row(InlineKeyboardButton(
+        text="Обзор 🖼", callback_data=AdminProductsCallback(action="overview", category=category).pack()
+    ))
+
+    return keyboard.as_markup()
+
+
+def clear_keyboards_cache():
+    for builder in (get_user_main_btns, _get_user_catalog_btns, _get_products_btns, _get_user_cart):
+        builder.cache_clear()
+
+
+def keyboards_cache_info():
+    return {
+        builder.__name__.lstrip("_"): builder.cache_info()._asdict()
+        for builder in (get_user_main_btns, _get_user_catalog_btns, _get_products_btns, _get_user_cart)
+    }
+
+
 def get_callback_btns(*, btns: dict[str, str], sizes: tuple[int] = (2,)):
     keyboard = InlineKeyboardBuilder()
 
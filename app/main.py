@@ -1,30 +1,156 @@
 import asyncio
+import logging
+from contextlib import suppress
 
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
 from aiogram.enums import ParseMode
 
+from app.common.restricted_words import restricted_words
+from app.common.texts_for_db import SEED_VERSION, description_for_info_pages, categories
 from app.config import settings
-from app.database import async_session_maker
+from app.database import async_session_maker, engine
 from app.handlers.admin_private import admin_router
 from app.handlers.user_group import user_group_router
 from app.handlers.user_private import user_private_router
+from app.keyboards.inline import keyboards_cache_info
 from app.middlewares.db import DataBaseSession
+from app.middlewares.outbound import OutboundScheduler
+from app.middlewares.scheduler import UpdateScheduler
+from app.middlewares.tracing import tracer
+from app.models.cart_buffer import cart_buffer
+from app.models.fsm_storage import PostgresStorage
+from app.models.services import SeedService, BannerService, CatalogService, UserService, ModerationService, AdminService
+from app.webhook import run_webhook
 
-bot = Bot(token=settings.TOKEN, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
-bot.my_admins_list = []
+bot_session = AiohttpSession(api=TelegramAPIServer.from_base(settings.TELEGRAM_API_URL)) if settings.TELEGRAM_API_URL else None
+bot = Bot(token=settings.TOKEN, session=bot_session, default=DefaultBotProperties(parse_mode=ParseMode.HTML))
+outbound = OutboundScheduler(
+    global_rate=settings.OUTBOUND_GLOBAL_RATE,
+    private_chat_rate=settings.OUTBOUND_PRIVATE_CHAT_RATE,
+    group_chat_rate=settings.OUTBOUND_GROUP_CHAT_RATE,
+    max_retries=settings.OUTBOUND_MAX_RETRIES
+)
+bot.session.middleware(tracer.api_tracer)
+bot.session.middleware(outbound)
 
-dp = Dispatcher()
+storage = PostgresStorage(async_session_maker, interval=settings.FSM_FLUSH_INTERVAL)
+
+dp = Dispatcher(storage=storage)
+
+scheduler = UpdateScheduler(
+    max_concurrency=settings.UPDATES_MAX_CONCURRENCY or engine.pool.size(),
+    max_pending=settings.UPDATES_MAX_PENDING
+)
+
+db_session = DataBaseSession(session_pool=async_session_maker)
 
 dp.include_router(user_private_router)
 dp.include_router(user_group_router)
 dp.include_router(admin_router)
 
 
+background_tasks: set[asyncio.Task] = set()
+
+
+async def reload_moderation_words():
+    while True:
+        await asyncio.sleep(settings.MODERATION_RELOAD_INTERVAL)
+
+        try:
+            async with async_session_maker() as session:
+                await ModerationService.service_reload_words(session)
+        except Exception:
+            logging.exception("Failed to reload restricted words")
+
+
+async def flush_user_profiles():
+    while True:
+        await asyncio.sleep(settings.PROFILES_FLUSH_INTERVAL)
+
+        try:
+            async with async_session_maker() as session:
+                await UserService.service_flush_profiles(session)
+        except Exception:
+            logging.exception("Failed to flush user profiles")
+
+
+async def on_startup():
+    async with async_session_maker() as session:
+        await SeedService.service_apply_seed(
+            session, SEED_VERSION, description_for_info_pages, categories, sorted(restricted_words)
+        )
+        await BannerService.service_warm_cache(session)
+        await CatalogService.service_refresh_catalog(session)
+        await ModerationService.service_reload_words(session)
+        await AdminService.service_load_admins(session)
+
+    background_tasks.add(asyncio.create_task(reload_moderation_words()))
+    background_tasks.add(asyncio.create_task(flush_user_profiles()))
+    storage.start()
+
+    if settings.CART_WRITE_BEHIND:
+        cart_buffer.start()
+
+
+async def on_shutdown():
+    for task in background_tasks:
+        task.cancel()
+
+        with suppress(asyncio.CancelledError):
+            await task
+
+    background_tasks.clear()
+
+    await scheduler.drain()
+    await storage.close()
+
+    if settings.CART_WRITE_BEHIND:
+        try:
+            await cart_buffer.stop()
+        except Exception:
+            logging.exception("Failed to flush cart write-behind buffer on shutdown")
+
+    async with async_session_maker() as session:
+        await UserService.service_flush_profiles(session)
+
+
+def collect_stats():
+    return {
+        "updates": scheduler.stats(),
+        "sessions": {
+            "updates_total": db_session.updates_total,
+            "updates_without_connection": db_session.updates_without_connection
+        },
+        "pool": engine.pool.stats(),
+        "tracing": tracer.stats(),
+        "outbound": outbound.stats(),
+        "fsm": storage.stats(),
+        "carts": cart_buffer.stats(),
+        "banners": BannerService.service_cache_stats(),
+        "keyboards": keyboards_cache_info()
+    }
+
+
+def setup_dispatcher():
+    dp.startup.register(on_startup)
+    dp.shutdown.register(on_shutdown)
+    scheduler.install(dp)
+    tracer.instrument_dispatcher(dp)
+    tracer.instrument_engine(engine)
+    dp.update.middleware(db_session)
+
+
 async def main():
-    dp.update.middleware(DataBaseSession(session_pool=async_session_maker))
-    await bot.delete_webhook(drop_pending_updates=True)
-    await dp.start_polling(bot, allowed_updates=dp.resolve_used_update_types())
+    setup_dispatcher()
+
+    if settings.MODE == "webhook":
+        await run_webhook(dp, bot)
+    else:
+        await bot.delete_webhook(drop_pending_updates=True)
+        await dp.start_polling(bot, handle_as_tasks=False, allowed_updates=dp.resolve_used_update_types())
 
 
 if __name__ == "__main__":
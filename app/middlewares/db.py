@@ -2,21 +2,23 @@ from typing import Callable, Dict, Any, Awaitable
 
 from aiogram import BaseMiddleware
 from aiogram.types import TelegramObject
-from sqlalchemy.ext.asyncio import async_sessionmaker, AsyncSession
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+from sqlalchemy.orm import Session
 
-from app.common.texts_for_db import description_for_info_pages, categories
-from app.models.services import BannerService, CategoryService
 
-
-async def init_data(session: AsyncSession):
-    await BannerService.service_add_banner(session, description_for_info_pages)
-    await CategoryService.service_create_categories(session, categories)
+@event.listens_for(Session, "after_begin")
+def mark_connected(session: Session, transaction, connection):
+    session.info["connected"] = True
 
 
 class DataBaseSession(BaseMiddleware):
     def __init__(self, session_pool: async_sessionmaker):
         self.session_pool = session_pool
 
+        self.updates_total = 0
+        self.updates_without_connection = 0
+
     async def __call__(
             self,
             handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
@@ -26,6 +28,10 @@ class DataBaseSession(BaseMiddleware):
         async with self.session_pool() as session:
             data["session"] = session
 
-            await init_data(session)
+            try:
+                return await handler(event, data)
+            finally:
+                self.updates_total += 1
 
-            return await handler(event, data)
+                if not session.info.get("connected"):
+                    self.updates_without_connection += 1
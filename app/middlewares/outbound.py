@@ -0,0 +1,196 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import contextmanager, suppress
+from contextvars import ContextVar
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType, Response
+
+INTERACTIVE = 0
+NORMAL = 1
+BULK = 2
+
+LIMITED_METHODS_PREFIXES = ("Send", "Edit", "Copy", "Forward")
+INTERACTIVE_METHODS_PREFIXES = ("Edit",)
+
+_priority: ContextVar[int | None] = ContextVar("outbound_priority", default=None)
+
+
+@contextmanager
+def outbound_priority(priority: int):
+    token = _priority.set(priority)
+
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class RateLimiter:
+    def __init__(self, rate: float, capacity: float = 1):
+        self.rate = rate
+        self.capacity = capacity
+
+        self._tokens = capacity
+        self._updated_at = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters: list[tuple[int, int]] = []
+        self._counter = itertools.count()
+        self._condition = asyncio.Condition()
+
+    def _delay(self) -> float:
+        now = time.monotonic()
+
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+        if now < self._blocked_until:
+            return self._blocked_until - now
+
+        if self._tokens >= 1:
+            return 0
+
+        return (1 - self._tokens) / self.rate
+
+    @property
+    def is_idle(self) -> bool:
+        return not self._waiters and self._delay() == 0 and self._tokens >= self.capacity
+
+    def pause(self, seconds: float):
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    async def acquire(self, priority: int = NORMAL):
+        ticket = (priority, next(self._counter))
+
+        async with self._condition:
+            heapq.heappush(self._waiters, ticket)
+            self._condition.notify_all()
+
+            try:
+                while True:
+                    if self._waiters[0] != ticket:
+                        await self._condition.wait()
+                        continue
+
+                    delay = self._delay()
+
+                    if delay <= 0:
+                        self._tokens -= 1
+                        return
+
+                    with suppress(asyncio.TimeoutError):
+                        await asyncio.wait_for(self._condition.wait(), delay)
+            finally:
+                self._waiters.remove(ticket)
+                heapq.heapify(self._waiters)
+                self._condition.notify_all()
+
+
+class OutboundScheduler(BaseRequestMiddleware):
+    def __init__(
+            self,
+            global_rate: float = 30,
+            private_chat_rate: float = 1,
+            group_chat_rate: float = 20 / 60,
+            max_retries: int = 3,
+            max_chats: int = 10_000
+    ):
+        self.private_chat_rate = private_chat_rate
+        self.group_chat_rate = group_chat_rate
+        self.max_retries = max_retries
+        self.max_chats = max_chats
+
+        self._global = RateLimiter(global_rate, capacity=max(1, global_rate))
+        self._chats: dict[int | str, RateLimiter] = {}
+
+        self.retries = 0
+        self._latency = {priority: [0, 0.0, 0.0] for priority in (INTERACTIVE, NORMAL, BULK)}
+
+    def set_global_rate(self, rate: float):
+        self._global = RateLimiter(rate, capacity=max(1, rate))
+
+    def _get_chat_limiter(self, chat_id: int | str) -> RateLimiter:
+        limiter = self._chats.get(chat_id)
+
+        if limiter is None:
+            if len(self._chats) >= self.max_chats:
+                self._chats = {key: value for key, value in self._chats.items() if not value.is_idle}
+
+            is_group = isinstance(chat_id, str) or chat_id < 0
+            limiter = RateLimiter(self.group_chat_rate if is_group else self.private_chat_rate, capacity=3)
+            self._chats[chat_id] = limiter
+
+        return limiter
+
+    @staticmethod
+    def get_priority(method: TelegramMethod) -> int:
+        priority = _priority.get()
+
+        if priority is not None:
+            return priority
+
+        if type(method).__name__.startswith(INTERACTIVE_METHODS_PREFIXES):
+            return INTERACTIVE
+
+        return NORMAL
+
+    async def _acquire(self, chat_id: int | str | None, priority: int):
+        started_at = time.monotonic()
+
+        if chat_id is not None:
+            await self._get_chat_limiter(chat_id).acquire(priority)
+
+        await self._global.acquire(priority)
+
+        waited = time.monotonic() - started_at
+        latency = self._latency[priority]
+        latency[0] += 1
+        latency[1] += waited
+        latency[2] = max(latency[2], waited)
+
+    async def __call__(
+            self,
+            make_request: NextRequestMiddlewareType[TelegramType],
+            bot: Bot,
+            method: TelegramMethod[TelegramType]
+    ) -> Response[TelegramType]:
+        if not type(method).__name__.startswith(LIMITED_METHODS_PREFIXES):
+            return await make_request(bot, method)
+
+        chat_id = getattr(method, "chat_id", None)
+        priority = self.get_priority(method)
+
+        for attempt in itertools.count():
+            await self._acquire(chat_id, priority)
+
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                if attempt >= self.max_retries:
+                    raise
+
+                self.retries += 1
+
+                if chat_id is not None:
+                    self._get_chat_limiter(chat_id).pause(e.retry_after)
+
+                self._global.pause(e.retry_after)
+
+    def stats(self):
+        return {
+            "retries": self.retries,
+            "chats": len(self._chats),
+            "latency": {
+                name: {
+                    "count": self._latency[priority][0],
+                    "avg": self._latency[priority][1] / self._latency[priority][0] if self._latency[priority][0] else 0,
+                    "max": self._latency[priority][2]
+                }
+                for name, priority in (("interactive", INTERACTIVE), ("normal", NORMAL), ("bulk", BULK))
+            }
+        }
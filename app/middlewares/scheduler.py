@@ -0,0 +1,127 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Dict, Any, Awaitable
+
+from aiogram import BaseMiddleware, Dispatcher
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.types import TelegramObject, ErrorEvent
+
+logger = logging.getLogger(__name__)
+
+
+class UpdateScheduler(BaseMiddleware):
+    def __init__(self, max_concurrency: int, max_pending: int = 1000):
+        self.max_concurrency = max_concurrency
+        self.max_pending = max_pending
+
+        self._slots = asyncio.Semaphore(max_concurrency)
+        self._capacity = asyncio.Semaphore(max_pending)
+        self._locks: dict[int, list] = {}
+        self._tasks: set[asyncio.Task] = set()
+
+        self.pending = 0
+        self.running = 0
+        self.max_pending_seen = 0
+        self.backpressure_waits = 0
+        self.processed = 0
+        self.dispatcher: Dispatcher | None = None
+
+    def install(self, dispatcher: Dispatcher):
+        self.dispatcher = dispatcher
+        dispatcher.update.outer_middleware.unregister(dispatcher.fsm)
+        dispatcher.update.outer_middleware(self)
+        dispatcher.update.outer_middleware(dispatcher.fsm)
+
+    @staticmethod
+    def get_key(data: Dict[str, Any]) -> int | None:
+        user = data.get("event_from_user")
+
+        if user is not None:
+            return user.id
+
+        chat = data.get("event_chat")
+
+        return chat.id if chat is not None else None
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any]
+    ) -> Any:
+        data["admitted_at"] = time.perf_counter()
+
+        if self._capacity.locked():
+            self.backpressure_waits += 1
+
+        await self._capacity.acquire()
+
+        self.pending += 1
+        self.max_pending_seen = max(self.max_pending_seen, self.pending)
+
+        task = asyncio.create_task(self._process(handler, event, data, self.get_key(data)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _process(self, handler, event: TelegramObject, data: Dict[str, Any], key: int | None):
+        lock = None
+
+        if key is not None:
+            lock = self._locks.setdefault(key, [asyncio.Lock(), 0])
+            lock[1] += 1
+            await lock[0].acquire()
+
+        try:
+            async with self._slots:
+                self.running += 1
+
+                try:
+                    await handler(event, data)
+                except Exception as e:
+                    await self._propagate_error(event, data, e, key)
+                finally:
+                    self.running -= 1
+                    self.processed += 1
+        finally:
+            if lock is not None:
+                lock[0].release()
+                lock[1] -= 1
+
+                if not lock[1]:
+                    del self._locks[key]
+
+            self.pending -= 1
+            self._capacity.release()
+
+    async def _propagate_error(self, event: TelegramObject, data: Dict[str, Any], exception: Exception, key: int | None):
+        if self.dispatcher is not None:
+            try:
+                response = await self.dispatcher.propagate_event(
+                    update_type="error",
+                    event=ErrorEvent(update=event, exception=exception),
+                    **data
+                )
+
+                if response is not UNHANDLED:
+                    return
+            except Exception as e:
+                exception = e
+
+        logger.error("Failed to process update for key %s", key, exc_info=exception)
+
+    async def drain(self):
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self):
+        return {
+            "pending": self.pending,
+            "waiting": self.pending - self.running,
+            "running": self.running,
+            "max_pending_seen": self.max_pending_seen,
+            "backpressure_waits": self.backpressure_waits,
+            "processed": self.processed,
+            "max_concurrency": self.max_concurrency,
+            "max_pending": self.max_pending
+        }
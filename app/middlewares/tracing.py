@@ -0,0 +1,231 @@
+import json
+import logging
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Callable, Dict, Any, Awaitable
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import BaseRequestMiddleware, NextRequestMiddlewareType
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType, Response
+from aiogram.types import TelegramObject, Update
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.config import settings
+
+slow_logger = logging.getLogger("app.slow_updates")
+
+UNHANDLED = "unhandled"
+
+
+class UpdateTrace:
+    __slots__ = ("handler", "queue_wait", "db_time", "db_queries", "api_time", "api_calls")
+
+    def __init__(self, queue_wait: float = 0.0):
+        self.handler = UNHANDLED
+        self.queue_wait = queue_wait
+        self.db_time = 0.0
+        self.db_queries = 0
+        self.api_time = 0.0
+        self.api_calls = 0
+
+
+_trace: ContextVar[UpdateTrace | None] = ContextVar("update_trace", default=None)
+
+
+class HandlerTracer(BaseMiddleware):
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any]
+    ) -> Any:
+        trace = _trace.get()
+
+        if trace is not None:
+            trace.handler = data["handler"].callback.__name__
+
+        return await handler(event, data)
+
+
+class ApiTracer(BaseRequestMiddleware):
+    async def __call__(
+            self,
+            make_request: NextRequestMiddlewareType[TelegramType],
+            bot: Bot,
+            method: TelegramMethod[TelegramType]
+    ) -> Response[TelegramType]:
+        trace = _trace.get()
+
+        if trace is None:
+            return await make_request(bot, method)
+
+        started_at = time.perf_counter()
+
+        try:
+            return await make_request(bot, method)
+        finally:
+            trace.api_time += time.perf_counter() - started_at
+            trace.api_calls += 1
+
+
+class UpdateTracer(BaseMiddleware):
+    def __init__(self, slow_threshold: float = 1.0, window: int = 1000):
+        self.slow_threshold = slow_threshold
+        self.window = window
+
+        self.handler_tracer = HandlerTracer()
+        self.api_tracer = ApiTracer()
+
+        self._latencies: dict[str, deque] = {}
+        self._totals: dict[str, list] = {}
+
+        self.updates = 0
+        self.slow_updates = 0
+        self.queue_wait = 0.0
+        self.max_queue_wait = 0.0
+        self.db_time = 0.0
+        self.db_queries = 0
+        self.api_time = 0.0
+        self.api_calls = 0
+
+    @staticmethod
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context.trace_started_at = time.perf_counter()
+
+    @staticmethod
+    def _finish_statement(context):
+        started_at = getattr(context, "trace_started_at", None)
+        trace = _trace.get()
+
+        if started_at is not None and trace is not None:
+            trace.db_time += time.perf_counter() - started_at
+            trace.db_queries += 1
+
+    @classmethod
+    def _after_cursor_execute(cls, conn, cursor, statement, parameters, context, executemany):
+        cls._finish_statement(context)
+
+    @classmethod
+    def _handle_error(cls, exception_context):
+        if exception_context.execution_context is not None:
+            cls._finish_statement(exception_context.execution_context)
+
+    def instrument_engine(self, engine: AsyncEngine):
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(engine.sync_engine, "handle_error", self._handle_error)
+
+    def instrument_dispatcher(self, dispatcher):
+        dispatcher.update.outer_middleware(self)
+
+        for name, observer in dispatcher.observers.items():
+            if name not in ("update", "error"):
+                observer.middleware(self.handler_tracer)
+
+    def _record(self, trace: UpdateTrace, elapsed: float):
+        latencies = self._latencies.get(trace.handler)
+
+        if latencies is None:
+            latencies = self._latencies[trace.handler] = deque(maxlen=self.window)
+            self._totals[trace.handler] = [0, 0.0, 0.0, 0, 0.0, 0, 0.0]
+
+        latencies.append(elapsed)
+
+        totals = self._totals[trace.handler]
+        totals[0] += 1
+        totals[1] += elapsed
+        totals[2] += trace.db_time
+        totals[3] += trace.db_queries
+        totals[4] += trace.api_time
+        totals[5] += trace.api_calls
+        totals[6] += trace.queue_wait
+
+        self.updates += 1
+        self.queue_wait += trace.queue_wait
+        self.max_queue_wait = max(self.max_queue_wait, trace.queue_wait)
+        self.db_time += trace.db_time
+        self.db_queries += trace.db_queries
+        self.api_time += trace.api_time
+        self.api_calls += trace.api_calls
+
+    def _log_slow(self, update: Update, trace: UpdateTrace, elapsed: float, data: Dict[str, Any]):
+        self.slow_updates += 1
+        user = data.get("event_from_user")
+
+        slow_logger.warning(json.dumps({
+            "update_id": update.update_id,
+            "event_type": update.event_type,
+            "user_id": user.id if user is not None else None,
+            "handler": trace.handler,
+            "queue_ms": round(trace.queue_wait * 1000, 2),
+            "total_ms": round(elapsed * 1000, 2),
+            "db_ms": round(trace.db_time * 1000, 2),
+            "db_queries": trace.db_queries,
+            "api_ms": round(trace.api_time * 1000, 2),
+            "api_calls": trace.api_calls
+        }))
+
+    async def __call__(
+            self,
+            handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+            event: TelegramObject,
+            data: Dict[str, Any]
+    ) -> Any:
+        started_at = time.perf_counter()
+        trace = UpdateTrace(queue_wait=started_at - data.get("admitted_at", started_at))
+        token = _trace.set(trace)
+
+        try:
+            return await handler(event, data)
+        finally:
+            elapsed = time.perf_counter() - started_at
+            _trace.reset(token)
+
+            self._record(trace, elapsed)
+
+            if elapsed >= self.slow_threshold:
+                self._log_slow(event, trace, elapsed, data)
+
+    @staticmethod
+    def _percentile(latencies: list[float], percent: float) -> float:
+        return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100))]
+
+    def handler_stats(self):
+        result = {}
+
+        for name, latencies in self._latencies.items():
+            latencies = sorted(latencies)
+            count, total, db_time, db_queries, api_time, api_calls, queue_wait = self._totals[name]
+
+            result[name] = {
+                "count": count,
+                "avg": total / count,
+                "p50": self._percentile(latencies, 50),
+                "p95": self._percentile(latencies, 95),
+                "p99": self._percentile(latencies, 99),
+                "queue_wait": queue_wait / count,
+                "db_time": db_time / count,
+                "db_queries": db_queries / count,
+                "api_time": api_time / count,
+                "api_calls": api_calls / count
+            }
+
+        return result
+
+    def stats(self):
+        return {
+            "updates": self.updates,
+            "slow_updates": self.slow_updates,
+            "queue_wait": self.queue_wait,
+            "max_queue_wait": self.max_queue_wait,
+            "db_time": self.db_time,
+            "db_queries": self.db_queries,
+            "api_time": self.api_time,
+            "api_calls": self.api_calls
+        }
+
+
+tracer = UpdateTracer(slow_threshold=settings.SLOW_UPDATE_THRESHOLD)
@@ -0,0 +1,46 @@
+"""carts unique user product
+
+Revision ID: 9e4d2b6a1c37
+Revises: 5b1f0c7e2a91
+Create Date: 2026-10-18 12:03:55.902714
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e4d2b6a1c37'
+down_revision: Union[str, None] = '5b1f0c7e2a91'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+        WITH merged AS (
+            SELECT min(id) AS keep_id, user_id, product_id, sum(quantity) AS quantity
+            FROM carts
+            GROUP BY user_id, product_id
+            HAVING count(*) > 1
+        ),
+        kept AS (
+            UPDATE carts SET quantity = merged.quantity
+            FROM merged
+            WHERE carts.id = merged.keep_id
+        )
+        DELETE FROM carts
+        USING merged
+        WHERE carts.user_id = merged.user_id
+            AND carts.product_id = merged.product_id
+            AND carts.id <> merged.keep_id
+        """
+    )
+    op.create_unique_constraint('uq_carts_user_id_product_id', 'carts', ['user_id', 'product_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_carts_user_id_product_id', 'carts', type_='unique')
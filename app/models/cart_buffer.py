@@ -0,0 +1,179 @@
+import asyncio
+import logging
+from contextlib import suppress
+from typing import NamedTuple
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.config import settings
+from app.database import async_session_maker
+from app.models.dao import CartDAO
+from app.utils.cache import LRUCache
+from app.utils.catalog import CatalogSnapshot, ProductItem
+from app.utils.paginator import Paginator
+
+logger = logging.getLogger(__name__)
+
+
+class CartLine(NamedTuple):
+    product: ProductItem
+    quantity: int
+
+
+class CartWriteBehind:
+    def __init__(self, session_pool: async_sessionmaker, interval: float = 1.0, max_users: int = 10_000):
+        self.session_pool = session_pool
+        self.interval = interval
+
+        self._carts = LRUCache(maxsize=max_users)
+        self._deltas: dict[tuple[int, int], int] = {}
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+        self.taps = 0
+        self.rows_written = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+
+    async def _get_cart(self, session: AsyncSession, user_id: int) -> dict[int, int]:
+        cart = self._carts.get(user_id)
+
+        if cart is None:
+            async with self._flush_lock:
+                carts = await CartDAO.db_get_user_carts(session, user_id)
+                cart = {line.product_id: line.quantity for line in carts}
+
+                for (delta_user_id, product_id), delta in self._deltas.items():
+                    if delta_user_id == user_id:
+                        cart[product_id] = cart.get(product_id, 0) + delta
+
+            cart = {product_id: quantity for product_id, quantity in cart.items() if quantity > 0}
+            self._carts.set(user_id, cart)
+
+        return cart
+
+    def _add_delta(self, user_id: int, product_id: int, delta: int):
+        key = (user_id, product_id)
+        self._deltas[key] = self._deltas.get(key, 0) + delta
+
+        if not self._deltas[key]:
+            del self._deltas[key]
+
+        self.taps += 1
+
+    async def increment(self, session: AsyncSession, user_id: int, product_id: int):
+        cart = await self._get_cart(session, user_id)
+        cart[product_id] = cart.get(product_id, 0) + 1
+        self._add_delta(user_id, product_id, 1)
+
+        return cart[product_id]
+
+    async def decrement(self, session: AsyncSession, user_id: int, product_id: int):
+        cart = await self._get_cart(session, user_id)
+        quantity = cart.get(product_id)
+
+        if not quantity:
+            return False
+
+        self._add_delta(user_id, product_id, -1)
+
+        if quantity > 1:
+            cart[product_id] = quantity - 1
+            return True
+
+        del cart[product_id]
+        return False
+
+    async def delete(self, session: AsyncSession, user_id: int, product_id: int):
+        cart = await self._get_cart(session, user_id)
+        quantity = cart.pop(product_id, 0)
+
+        if quantity:
+            self._add_delta(user_id, product_id, -quantity)
+
+    async def get_summary(self, session: AsyncSession, user_id: int, page: int, catalog: CatalogSnapshot):
+        cart = await self._get_cart(session, user_id)
+        lines = [
+            CartLine(product=product, quantity=quantity)
+            for product_id, quantity in cart.items()
+            if (product := catalog.get_product(product_id))
+        ]
+        aggregates = {
+            "items_count": sum(line.quantity for line in lines),
+            "total_price": sum(line.quantity * line.product.price for line in lines)
+        }
+        paginator = Paginator(lines, page=page, aggregates=aggregates)
+
+        if paginator.pages and paginator.page > paginator.pages:
+            paginator.page = paginator.pages
+
+        return paginator
+
+    async def flush(self, user_id: int | None = None):
+        async with self._flush_lock:
+            if user_id is None:
+                deltas, self._deltas = self._deltas, {}
+            else:
+                deltas = {key: self._deltas.pop(key) for key in list(self._deltas) if key[0] == user_id}
+
+            if not deltas:
+                return 0
+
+            try:
+                async with self.session_pool() as session:
+                    await CartDAO.db_apply_deltas(
+                        session,
+                        [
+                            {"user_id": delta_user_id, "product_id": product_id, "quantity": delta}
+                            for (delta_user_id, product_id), delta in deltas.items()
+                        ]
+                    )
+                    await session.commit()
+            except Exception:
+                for key, delta in deltas.items():
+                    self._deltas[key] = self._deltas.get(key, 0) + delta
+
+                self.failed_flushes += 1
+                raise
+
+            self.flushes += 1
+            self.rows_written += len(deltas)
+
+            return len(deltas)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Cart write-behind flush failed, %s deltas kept for retry", len(self._deltas))
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+
+            with suppress(asyncio.CancelledError):
+                await self._task
+
+            self._task = None
+
+        await self.flush()
+
+    def stats(self):
+        return {
+            "taps": self.taps,
+            "rows_written": self.rows_written,
+            "coalesced": self.taps - self.rows_written - len(self._deltas),
+            "pending": len(self._deltas),
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes
+        }
+
+
+cart_buffer = CartWriteBehind(async_session_maker, interval=settings.CART_FLUSH_INTERVAL)
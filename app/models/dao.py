@@ -1,14 +1,101 @@
-from sqlalchemy import select
+from typing import AsyncIterator, Iterable
+
+from sqlalchemy import (
+    select, func, update, delete, bindparam, tuple_, exists, MetaData, Table, Column, Integer, String, Text, Numeric
+)
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, contains_eager
 
 from app.dao.base import BaseDAO
-from app.models.models import Product, Banner, Category, User, Cart
+from app.models.models import (
+    Product, Banner, Category, User, Cart, SeedVersion, RestrictedWord, ChatAdmin, FSMRecord
+)
+from app.utils.paginator import QueryPaginator
+
+
+SEED_LOCK_ID = 7340123
+
+import_metadata = MetaData()
+
+products_import = Table(
+    "products_import",
+    import_metadata,
+    Column("line", Integer),
+    Column("name", String(150)),
+    Column("description", Text),
+    Column("price", Numeric(5, 2)),
+    Column("image", String(150)),
+    Column("category", String(150)),
+    prefixes=["TEMPORARY"],
+    postgresql_on_commit="DROP"
+)
 
 
 class ProductDAO(BaseDAO):
     model = Product
 
+    @classmethod
+    async def db_get_products_page(cls, session: AsyncSession, category_id: int, page: int, per_page: int = 1):
+        query = select(cls.model).filter_by(category_id=category_id).order_by(cls.model.id)
+        return await QueryPaginator(query, page=page, per_page=per_page).fetch(session)
+
+    @classmethod
+    async def db_import_products(cls, session: AsyncSession, records: Iterable[tuple]):
+        connection = await session.connection()
+        await connection.run_sync(products_import.create)
+
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            products_import.name, records=records, columns=[column.name for column in products_import.columns]
+        )
+
+        latest = (
+            select(products_import)
+            .distinct(products_import.c.category, products_import.c.name)
+            .order_by(products_import.c.category, products_import.c.name, products_import.c.line.desc())
+            .subquery("latest")
+        )
+
+        categories = await session.execute(
+            insert(Category).from_select(
+                ["name"],
+                select(latest.c.category).distinct().where(~exists().where(Category.name == latest.c.category))
+            )
+        )
+        updated = await session.execute(
+            update(cls.model)
+            .where(
+                cls.model.category_id == Category.id,
+                Category.name == latest.c.category,
+                cls.model.name == latest.c.name
+            )
+            .values(description=latest.c.description, price=latest.c.price, image=latest.c.image)
+            .execution_options(synchronize_session=False)
+        )
+        inserted = await session.execute(
+            insert(cls.model).from_select(
+                ["name", "description", "price", "image", "category_id"],
+                select(latest.c.name, latest.c.description, latest.c.price, latest.c.image, Category.id)
+                .join(Category, Category.name == latest.c.category)
+                .where(~exists().where(cls.model.category_id == Category.id, cls.model.name == latest.c.name))
+            )
+        )
+
+        return {"categories": categories.rowcount, "inserted": inserted.rowcount, "updated": updated.rowcount}
+
+    @classmethod
+    async def db_stream_catalog(cls, session: AsyncSession, batch_size: int = 1000) -> AsyncIterator[list]:
+        query = (
+            select(cls.model.name, cls.model.description, cls.model.price, cls.model.image, Category.name)
+            .join(cls.model.category)
+            .order_by(Category.id, cls.model.id)
+        )
+        result = await session.stream(query, execution_options={"yield_per": batch_size})
+
+        async for batch in result.partitions():
+            yield batch
+
 
 class BannerDAO(BaseDAO):
     model = Banner
@@ -21,16 +108,200 @@ class CategoryDAO(BaseDAO):
 class UserDAO(BaseDAO):
     model = User
 
+    @classmethod
+    async def db_add_if_not_exists(cls, session: AsyncSession, **values):
+        query = (
+            insert(cls.model)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[cls.model.telegram_id])
+            .returning(cls.model.id)
+        )
+        result = await session.execute(query)
+        return result.scalar_one_or_none() is not None
+
+    @classmethod
+    async def db_update_profiles(cls, session: AsyncSession, profiles: list[dict]):
+        table = cls.model.__table__
+        query = (
+            update(table)
+            .where(table.c.telegram_id == bindparam("b_telegram_id"))
+            .values(first_name=bindparam("b_first_name"), last_name=bindparam("b_last_name"), updated_at=func.now())
+        )
+        await session.execute(
+            query,
+            [
+                {
+                    "b_telegram_id": profile["telegram_id"],
+                    "b_first_name": profile["first_name"],
+                    "b_last_name": profile["last_name"]
+                }
+                for profile in profiles
+            ]
+        )
+
 
 class CartDAO(BaseDAO):
     model = Cart
 
     @classmethod
-    async def db_get_user_carts(cls, session: AsyncSession, user_id: int):
-        query = (
+    def db_user_carts_query(cls, user_id: int):
+        return (
             select(cls.model)
             .options(joinedload(cls.model.product))
             .filter_by(user_id=user_id)
+            .order_by(cls.model.id)
         )
-        result = await session.execute(query)
+
+    @classmethod
+    async def db_get_user_carts(cls, session: AsyncSession, user_id: int):
+        result = await session.execute(cls.db_user_carts_query(user_id))
         return result.scalars().all()
+
+    @classmethod
+    async def db_get_cart_summary(cls, session: AsyncSession, user_id: int, page: int, per_page: int = 1):
+        query = (
+            select(cls.model)
+            .join(cls.model.product)
+            .options(contains_eager(cls.model.product))
+            .filter(cls.model.user_id == user_id)
+            .order_by(cls.model.id)
+        )
+        aggregates = {
+            "items_count": func.sum(cls.model.quantity),
+            "total_price": func.sum(cls.model.quantity * Product.price)
+        }
+        return await QueryPaginator(query, page=page, per_page=per_page, aggregates=aggregates).fetch(session)
+
+    @classmethod
+    async def db_increment(cls, session: AsyncSession, user_id: int, product_id: int):
+        query = (
+            insert(cls.model)
+            .values(user_id=user_id, product_id=product_id, quantity=1)
+            .on_conflict_do_update(
+                constraint="uq_carts_user_id_product_id",
+                set_={"quantity": cls.model.quantity + 1, "updated_at": func.now()}
+            )
+            .returning(cls.model.quantity)
+        )
+        result = await session.execute(query)
+        return result.scalar_one()
+
+    @classmethod
+    async def db_decrement(cls, session: AsyncSession, user_id: int, product_id: int):
+        condition = (cls.model.user_id == user_id, cls.model.product_id == product_id)
+
+        updated = (
+            update(cls.model)
+            .where(*condition, cls.model.quantity > 1)
+            .values(quantity=cls.model.quantity - 1, updated_at=func.now())
+            .returning(cls.model.quantity)
+            .cte("updated")
+        )
+        deleted = (
+            delete(cls.model)
+            .where(*condition, cls.model.quantity <= 1)
+            .returning(cls.model.id)
+            .cte("deleted")
+        )
+        query = select(select(updated.c.quantity).scalar_subquery(), select(deleted.c.id).scalar_subquery())
+        result = await session.execute(query)
+        return result.one()
+
+    @classmethod
+    async def db_delete(cls, session: AsyncSession, user_id: int, product_id: int):
+        query = (
+            delete(cls.model)
+            .where(cls.model.user_id == user_id, cls.model.product_id == product_id)
+            .returning(cls.model.id)
+        )
+        result = await session.execute(query)
+        return result.scalar_one_or_none()
+
+    @classmethod
+    async def db_apply_deltas(cls, session: AsyncSession, deltas: list[dict]):
+        product_ids = {delta["product_id"] for delta in deltas}
+        result = await session.execute(select(Product.id).filter(Product.id.in_(product_ids)))
+        existing_ids = set(result.scalars().all())
+
+        rows = [delta for delta in deltas if delta["product_id"] in existing_ids]
+
+        if not rows:
+            return
+
+        query = insert(cls.model)
+        query = query.on_conflict_do_update(
+            constraint="uq_carts_user_id_product_id",
+            set_={"quantity": cls.model.quantity + query.excluded.quantity, "updated_at": func.now()}
+        )
+        await session.execute(query, rows)
+
+        await session.execute(
+            delete(cls.model)
+            .where(cls.model.user_id.in_({row["user_id"] for row in rows}), cls.model.quantity <= 0)
+        )
+
+
+class RestrictedWordDAO(BaseDAO):
+    model = RestrictedWord
+
+    @classmethod
+    async def db_get_revision(cls, session: AsyncSession):
+        query = select(func.count(cls.model.id), func.max(cls.model.updated_at))
+        result = await session.execute(query)
+        return tuple(result.one())
+
+    @classmethod
+    async def db_add_words(cls, session: AsyncSession, words: list[str]):
+        if not words:
+            return
+
+        query = insert(cls.model).on_conflict_do_nothing(index_elements=[cls.model.word])
+        await session.execute(query, [{"word": word} for word in words])
+
+
+class ChatAdminDAO(BaseDAO):
+    model = ChatAdmin
+
+    @classmethod
+    async def db_replace_chat_admins(cls, session: AsyncSession, chat_id: int, user_ids: set[int]):
+        await cls.delete_many(session, chat_id=chat_id)
+        await cls.add_many(session, [{"chat_id": chat_id, "user_id": user_id} for user_id in user_ids])
+
+
+class FSMRecordDAO(BaseDAO):
+    model = FSMRecord
+
+    @classmethod
+    def db_key_columns(cls):
+        return cls.model.bot_id, cls.model.chat_id, cls.model.user_id, cls.model.thread_id, cls.model.destiny
+
+    @classmethod
+    async def db_get_record(cls, session: AsyncSession, key: tuple):
+        query = select(cls.model.state, cls.model.data).where(tuple_(*cls.db_key_columns()) == key)
+        result = await session.execute(query)
+        return result.one_or_none()
+
+    @classmethod
+    async def db_save_records(cls, session: AsyncSession, records: list[dict]):
+        if not records:
+            return
+
+        query = insert(cls.model)
+        query = query.on_conflict_do_update(
+            constraint="uq_fsm_records_key",
+            set_={"state": query.excluded.state, "data": query.excluded.data, "updated_at": func.now()}
+        )
+        await session.execute(query, records)
+
+    @classmethod
+    async def db_delete_records(cls, session: AsyncSession, keys: list[tuple]):
+        if keys:
+            await session.execute(delete(cls.model).where(tuple_(*cls.db_key_columns()).in_(keys)))
+
+
+class SeedVersionDAO(BaseDAO):
+    model = SeedVersion
+
+    @classmethod
+    async def db_lock(cls, session: AsyncSession):
+        await session.execute(select(func.pg_advisory_xact_lock(SEED_LOCK_ID)))
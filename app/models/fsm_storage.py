@@ -0,0 +1,162 @@
+import asyncio
+import logging
+from contextlib import suppress
+from typing import Any, Dict, Optional
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StorageKey, StateType
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.models.dao import FSMRecordDAO
+from app.utils.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+RecordKey = tuple[int, int, int, int, str]
+Record = tuple[Optional[str], Dict[str, Any]]
+
+
+class PostgresStorage(BaseStorage):
+    def __init__(self, session_pool: async_sessionmaker, interval: float = 1.0, max_keys: int = 10_000):
+        self.session_pool = session_pool
+        self.interval = interval
+
+        self._records = LRUCache(maxsize=max_keys)
+        self._dirty: dict[RecordKey, Record] = {}
+        self._flushing: dict[RecordKey, Record] = {}
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+        self.writes = 0
+        self.rows_written = 0
+        self.db_reads = 0
+        self.flushes = 0
+        self.failed_flushes = 0
+
+    @staticmethod
+    def get_key(key: StorageKey) -> RecordKey:
+        return key.bot_id, key.chat_id, key.user_id, key.thread_id or 0, key.destiny
+
+    async def _get_record(self, key: StorageKey) -> Record:
+        record_key = self.get_key(key)
+        record = self._records.get(record_key)
+
+        if record is None:
+            record = self._dirty.get(record_key) or self._flushing.get(record_key)
+
+        if record is None:
+            async with self.session_pool() as session:
+                row = await FSMRecordDAO.db_get_record(session, record_key)
+
+            self.db_reads += 1
+            record = (row.state, row.data) if row else (None, {})
+
+        self._records.set(record_key, record)
+
+        return record
+
+    def _set_record(self, key: StorageKey, state: Optional[str], data: Dict[str, Any]):
+        record_key = self.get_key(key)
+        record = (state, data)
+
+        self._records.set(record_key, record)
+        self._dirty[record_key] = record
+        self.writes += 1
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        _, data = await self._get_record(key)
+        self._set_record(key, state.state if isinstance(state, State) else state, data)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        state, _ = await self._get_record(key)
+        return state
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        state, _ = await self._get_record(key)
+        self._set_record(key, state, data.copy())
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        _, data = await self._get_record(key)
+        return data.copy()
+
+    async def flush(self):
+        async with self._flush_lock:
+            records, self._dirty = self._dirty, {}
+
+            if not records:
+                return 0
+
+            self._flushing = records
+
+            try:
+                async with self.session_pool() as session:
+                    await FSMRecordDAO.db_save_records(
+                        session,
+                        [
+                            {
+                                "bot_id": bot_id,
+                                "chat_id": chat_id,
+                                "user_id": user_id,
+                                "thread_id": thread_id,
+                                "destiny": destiny,
+                                "state": state,
+                                "data": data
+                            }
+                            for (bot_id, chat_id, user_id, thread_id, destiny), (state, data) in records.items()
+                            if state is not None or data
+                        ]
+                    )
+                    await FSMRecordDAO.db_delete_records(
+                        session,
+                        [key for key, (state, data) in records.items() if state is None and not data]
+                    )
+                    await session.commit()
+            except Exception:
+                for key, record in records.items():
+                    self._dirty.setdefault(key, record)
+
+                self.failed_flushes += 1
+                raise
+            finally:
+                self._flushing = {}
+
+            self.flushes += 1
+            self.rows_written += len(records)
+
+            return len(records)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("FSM storage flush failed, %s records kept for retry", len(self._dirty))
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+
+            with suppress(asyncio.CancelledError):
+                await self._task
+
+            self._task = None
+
+        await self.flush()
+
+    def stats(self):
+        return {
+            "writes": self.writes,
+            "rows_written": self.rows_written,
+            "coalesced": self.writes - self.rows_written - len(self._dirty),
+            "pending": len(self._dirty),
+            "db_reads": self.db_reads,
+            "cache": self._records.stats(),
+            "flushes": self.flushes,
+            "failed_flushes": self.failed_flushes
+        }
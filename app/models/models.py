@@ -1,6 +1,7 @@
 from typing import Annotated, Optional
 
-from sqlalchemy import String, Text, Numeric, ForeignKey, BigInteger
+from sqlalchemy import String, Text, Numeric, ForeignKey, BigInteger, UniqueConstraint, Index
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from app.database import Base
@@ -28,6 +29,7 @@ class Category(Base):
 
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (Index("ix_products_category_id_id", "category_id", "id"),)
 
     id: Mapped[intpk]
     name: Mapped[str] = mapped_column(String(150))
@@ -54,6 +56,11 @@ class User(Base):
 
 class Cart(Base):
     __tablename__ = "carts"
+    __table_args__ = (
+        UniqueConstraint("user_id", "product_id", name="uq_carts_user_id_product_id"),
+        Index("ix_carts_user_id_id", "user_id", "id"),
+        Index("ix_carts_product_id", "product_id"),
+    )
 
     id: Mapped[intpk]
     user_id: Mapped[int] = mapped_column(ForeignKey("users.telegram_id", ondelete="CASCADE"))
@@ -62,3 +69,42 @@ class Cart(Base):
 
     user: Mapped["User"] = relationship(back_populates="cart")
     product: Mapped["Product"] = relationship(back_populates="cart")
+
+
+class SeedVersion(Base):
+    __tablename__ = "seed_versions"
+
+    id: Mapped[intpk]
+    version: Mapped[int] = mapped_column(unique=True)
+
+
+class RestrictedWord(Base):
+    __tablename__ = "restricted_words"
+
+    id: Mapped[intpk]
+    word: Mapped[str] = mapped_column(String(150), unique=True)
+
+
+class ChatAdmin(Base):
+    __tablename__ = "chat_admins"
+    __table_args__ = (UniqueConstraint("chat_id", "user_id", name="uq_chat_admins_chat_id_user_id"),)
+
+    id: Mapped[intpk]
+    chat_id: Mapped[int] = mapped_column(BigInteger)
+    user_id: Mapped[int] = mapped_column(BigInteger)
+
+
+class FSMRecord(Base):
+    __tablename__ = "fsm_records"
+    __table_args__ = (
+        UniqueConstraint("bot_id", "chat_id", "user_id", "thread_id", "destiny", name="uq_fsm_records_key"),
+    )
+
+    id: Mapped[intpk]
+    bot_id: Mapped[int] = mapped_column(BigInteger)
+    chat_id: Mapped[int] = mapped_column(BigInteger)
+    user_id: Mapped[int] = mapped_column(BigInteger)
+    thread_id: Mapped[int] = mapped_column(BigInteger, default=0)
+    destiny: Mapped[str] = mapped_column(String(50))
+    state: Mapped[Optional[str]] = mapped_column(String(150))
+    data: Mapped[dict] = mapped_column(JSONB, default=dict)
@@ -1,7 +1,27 @@
+import asyncio
+import logging
+import time
+from typing import Callable, Iterable, AsyncIterator
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramAPIError, TelegramForbiddenError
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.dao import ProductDAO, BannerDAO, CategoryDAO, UserDAO, CartDAO
-from app.models.models import Product, Banner, Category, User, Cart
+from app.config import settings
+from app.models.cart_buffer import cart_buffer
+from app.common.restricted_words import restricted_words
+from app.database import async_session_maker
+from app.models.dao import (
+    ProductDAO, BannerDAO, CategoryDAO, UserDAO, CartDAO, SeedVersionDAO, RestrictedWordDAO, ChatAdminDAO
+)
+from app.models.models import Product, Banner, Category, SeedVersion
+from app.utils.cache import LRUCache
+from app.utils.catalog import CatalogSnapshot
+from app.utils.catalog_io import write_catalog_records
+from app.utils.moderation import ModerationEngine
+
+logger = logging.getLogger(__name__)
 
 
 class ProductService:
@@ -18,10 +38,16 @@ class ProductService:
         session.add(product)
         await session.commit()
 
+        await CatalogService.service_refresh_catalog(session)
+
     @classmethod
     async def service_get_all_products(cls, session: AsyncSession, category_id: int):
         return await ProductDAO.get_all(session, category_id=category_id)
 
+    @classmethod
+    async def service_get_products_page(cls, session: AsyncSession, category_id: int, page: int, per_page: int = 1):
+        return await ProductDAO.db_get_products_page(session, category_id, page, per_page)
+
     @classmethod
     async def service_get_one_product(cls, session: AsyncSession, product_id: int):
         return await ProductDAO.get_one(session, id=product_id)
@@ -31,11 +57,16 @@ class ProductService:
         product = await cls.service_get_one_product(session, product_id)
 
         if product:
-            for filed, value in data.items():
-                setattr(product, filed, value)
+            product.name = data["name"]
+            product.description = data["description"]
+            product.price = float(data["price"])
+            product.image = data["image"]
+            product.category_id = int(data["category"])
 
             await session.commit()
 
+            await CatalogService.service_refresh_catalog(session)
+
     @classmethod
     async def service_delete_product(cls, session: AsyncSession, product_id: int):
         product = await cls.service_get_one_product(session, product_id)
@@ -45,18 +76,86 @@ class ProductService:
 
         await session.commit()
 
+        await CatalogService.service_refresh_catalog(session)
+
+
+class CatalogService:
+    _snapshot: CatalogSnapshot | None = None
+    _version = 0
+    _invalidation_hooks: list[Callable[[], None]] = []
 
-class BannerService:
     @classmethod
-    async def service_add_banner(cls, session: AsyncSession, data: dict):
-        banner = await BannerDAO.get_first(session)
+    def service_add_invalidation_hook(cls, hook: Callable[[], None]):
+        cls._invalidation_hooks.append(hook)
+
+    @classmethod
+    async def service_get_catalog(cls, session: AsyncSession) -> CatalogSnapshot:
+        if cls._snapshot is None:
+            return await cls.service_refresh_catalog(session)
+
+        return cls._snapshot
+
+    @classmethod
+    async def service_refresh_catalog(cls, session: AsyncSession) -> CatalogSnapshot:
+        cls._version += 1
+        version = cls._version
+
+        categories = await CategoryDAO.get_all(session)
+        products = await ProductDAO.get_all(session)
+        snapshot = CatalogSnapshot(version, categories, products)
 
-        if not banner:
-            banners = [Banner(name=name, description=description) for name, description in data.items()]
-            session.add_all(banners)
+        if cls._snapshot is None or cls._snapshot.version < version:
+            cls._snapshot = snapshot
 
+            for hook in cls._invalidation_hooks:
+                hook()
+
+        return cls._snapshot
+
+
+    @classmethod
+    async def service_import_catalog(cls, session: AsyncSession, records: Iterable[tuple]):
+        result = await ProductDAO.db_import_products(session, records)
         await session.commit()
 
+        await cls.service_refresh_catalog(session)
+
+        return result
+
+    @classmethod
+    async def service_export_catalog(cls, session: AsyncSession, catalog_format: str) -> AsyncIterator[str]:
+        header = True
+
+        async for batch in ProductDAO.db_stream_catalog(session):
+            yield write_catalog_records(batch, catalog_format, header=header)
+            header = False
+
+        if header:
+            yield write_catalog_records([], catalog_format, header=header)
+
+
+class BannerService:
+    _banners: dict[str, Banner] | None = None
+
+    cache_hits = 0
+    cache_misses = 0
+
+    _invalidation_hooks: list[Callable[[], None]] = []
+
+    @classmethod
+    def service_add_invalidation_hook(cls, hook: Callable[[], None]):
+        cls._invalidation_hooks.append(hook)
+
+    @classmethod
+    async def service_add_banner(cls, session: AsyncSession, data: dict):
+        banners = {banner.name: banner for banner in await BannerDAO.get_all(session)}
+
+        for name, description in data.items():
+            if name in banners:
+                banners[name].description = description
+            else:
+                session.add(Banner(name=name, description=description))
+
     @classmethod
     async def service_change_banner_image(cls, session: AsyncSession, name: str, image: str):
         banner = await BannerDAO.get_one(session, name=name)
@@ -66,13 +165,43 @@ class BannerService:
 
         await session.commit()
 
+        cls.service_invalidate_cache()
+
+    @classmethod
+    async def service_warm_cache(cls, session: AsyncSession):
+        banners = await BannerDAO.get_all(session)
+        cls._banners = {banner.name: banner for banner in banners}
+
+    @classmethod
+    def service_invalidate_cache(cls):
+        cls._banners = None
+
+        for hook in cls._invalidation_hooks:
+            hook()
+
+    @classmethod
+    def service_cache_stats(cls):
+        return {"hits": cls.cache_hits, "misses": cls.cache_misses}
+
+    @classmethod
+    async def _get_cached_banners(cls, session: AsyncSession):
+        if cls._banners is None:
+            cls.cache_misses += 1
+            await cls.service_warm_cache(session)
+        else:
+            cls.cache_hits += 1
+
+        return cls._banners
+
     @classmethod
     async def service_get_banner(cls, session: AsyncSession, page: str):
-        return await BannerDAO.get_one(session, name=page)
+        banners = await cls._get_cached_banners(session)
+        return banners.get(page)
 
     @classmethod
     async def service_get_info_pages(cls, session: AsyncSession):
-        return await BannerDAO.get_all(session)
+        banners = await cls._get_cached_banners(session)
+        return list(banners.values())
 
 
 class CategoryService:
@@ -82,16 +211,17 @@ class CategoryService:
 
     @classmethod
     async def service_create_categories(cls, session: AsyncSession, categories: list):
-        category = await CategoryDAO.get_first(session)
+        names = {category.name for category in await CategoryDAO.get_all(session)}
 
-        if not category:
-            categories_all = [Category(name=name) for name in categories]
-            session.add_all(categories_all)
-
-        await session.commit()
+        session.add_all([Category(name=name) for name in categories if name not in names])
 
 
 class UserService:
+    known_users = LRUCache(maxsize=10_000)
+    profiles_batch_size = 100
+
+    _pending_profiles: dict[int, dict] = {}
+
     @classmethod
     async def service_add_user(
             cls,
@@ -101,59 +231,248 @@ class UserService:
             last_name: str | None = None,
             phone: str | None = None
     ):
-        user = await UserDAO.get_one(session, telegram_id=telegram_id)
+        profile = (first_name, last_name)
+        known_profile = cls.known_users.get(telegram_id)
+
+        if known_profile == profile:
+            return
 
-        if not user:
-            db_user = User(
+        if known_profile is None:
+            is_created = await UserDAO.db_add_if_not_exists(
+                session,
                 telegram_id=telegram_id,
                 first_name=first_name,
                 last_name=last_name,
                 phone=phone
             )
-            session.add(db_user)
             await session.commit()
 
+            cls.known_users.set(telegram_id, profile)
+
+            if is_created:
+                return
+        else:
+            cls.known_users.set(telegram_id, profile)
+
+        cls._pending_profiles[telegram_id] = {"first_name": first_name, "last_name": last_name}
+
+        if len(cls._pending_profiles) >= cls.profiles_batch_size:
+            await cls.service_flush_profiles(session)
+
+    @classmethod
+    async def service_flush_profiles(cls, session: AsyncSession):
+        if not cls._pending_profiles:
+            return
+
+        profiles, cls._pending_profiles = cls._pending_profiles, {}
+
+        try:
+            await UserDAO.db_update_profiles(
+                session, [{"telegram_id": telegram_id, **profile} for telegram_id, profile in profiles.items()]
+            )
+            await session.commit()
+        except Exception:
+            cls._pending_profiles = {**profiles, **cls._pending_profiles}
+            raise
+
 
 class CartService:
     @classmethod
     async def service_add_to_cart(cls, session: AsyncSession, user_id: int, product_id: int):
-        cart = await CartDAO.get_one(session, user_id=user_id, product_id=product_id)
-
-        if not cart:
-            cart = Cart(user_id=user_id, product_id=product_id, quantity=1)
-            session.add(cart)
-        else:
-            cart.quantity += 1
+        if settings.CART_WRITE_BEHIND:
+            return await cart_buffer.increment(session, user_id, product_id)
 
+        quantity = await CartDAO.db_increment(session, user_id, product_id)
         await session.commit()
 
-        return cart
+        return quantity
 
     @classmethod
     async def service_get_user_carts(cls, session: AsyncSession, user_id: int):
         return await CartDAO.db_get_user_carts(session, user_id)
 
     @classmethod
-    async def service_delete_from_cart(cls, session: AsyncSession, user_id: int, product_id: int):
-        cart = await CartDAO.get_one(session, user_id=user_id, product_id=product_id)
+    async def service_get_cart_summary(cls, session: AsyncSession, user_id: int, page: int):
+        if settings.CART_WRITE_BEHIND:
+            catalog = await CatalogService.service_get_catalog(session)
+            return await cart_buffer.get_summary(session, user_id, page, catalog)
+
+        return await CartDAO.db_get_cart_summary(session, user_id, page)
 
-        if cart:
-            await session.delete(cart)
+    @classmethod
+    async def service_delete_from_cart(cls, session: AsyncSession, user_id: int, product_id: int):
+        if settings.CART_WRITE_BEHIND:
+            await cart_buffer.delete(session, user_id, product_id)
+            return
 
+        await CartDAO.db_delete(session, user_id, product_id)
         await session.commit()
 
     @classmethod
     async def service_reduce_product_in_cart(cls, session: AsyncSession, user_id: int, product_id: int):
-        cart = await CartDAO.get_one(session, user_id=user_id, product_id=product_id)
+        if settings.CART_WRITE_BEHIND:
+            return await cart_buffer.decrement(session, user_id, product_id)
+
+        quantity, _ = await CartDAO.db_decrement(session, user_id, product_id)
+        await session.commit()
+
+        return quantity is not None
+
+    @classmethod
+    async def service_checkout(cls, user_id: int) -> bool:
+        if settings.CART_WRITE_BEHIND:
+            try:
+                await cart_buffer.flush(user_id)
+            except Exception:
+                logger.exception("Failed to flush cart of user %s on checkout", user_id)
+                return False
+
+        return True
+
+
+class ModerationService:
+    engine = ModerationEngine(restricted_words)
+
+    _revision = None
+
+    @classmethod
+    async def service_reload_words(cls, session: AsyncSession, force: bool = False):
+        revision = await RestrictedWordDAO.db_get_revision(session)
 
-        if not cart:
+        if revision == cls._revision and not force:
             return False
 
-        if cart.quantity > 1:
-            cart.quantity -= 1
+        words = [word.word for word in await RestrictedWordDAO.get_all(session)]
+        cls.engine = await asyncio.to_thread(ModerationEngine, words)
+        cls._revision = revision
+
+        return True
+
+    @classmethod
+    def service_find_restricted_word(cls, text: str | None):
+        if not text:
+            return None
+
+        return cls.engine.find(text)
+
+
+class AdminService:
+    ttl = 600
+
+    _chats: dict[int, tuple[frozenset[int], float]] = {}
+    _admins: frozenset[int] = frozenset()
+    _refreshing: dict[int, asyncio.Task] = {}
+    _invalidation_hooks: list[Callable[[], None]] = []
+
+    @classmethod
+    def service_add_invalidation_hook(cls, hook: Callable[[], None]):
+        cls._invalidation_hooks.append(hook)
+
+    @classmethod
+    def _set_chat_admins(cls, chat_id: int, admins: frozenset[int] | None, fetched_at: float = 0):
+        if admins is None:
+            cls._chats.pop(chat_id, None)
+        else:
+            cls._chats[chat_id] = (admins, fetched_at)
+
+        cls._admins = frozenset().union(*(chat_admins for chat_admins, _ in cls._chats.values()))
+
+    @classmethod
+    async def service_load_admins(cls, session: AsyncSession, fetched_at: float = 0):
+        chats = {}
+
+        for admin in await ChatAdminDAO.get_all(session):
+            chats.setdefault(admin.chat_id, set()).add(admin.user_id)
+
+        cls._chats = {chat_id: (frozenset(admins), fetched_at) for chat_id, admins in chats.items()}
+        cls._admins = frozenset().union(*chats.values())
+
+    @classmethod
+    def service_is_admin(cls, user_id: int, chat_id: int | None = None) -> bool:
+        if chat_id is None:
+            return user_id in cls._admins
+
+        chat = cls._chats.get(chat_id)
+
+        return chat is not None and user_id in chat[0]
+
+    @classmethod
+    async def _refresh_chat(cls, bot: Bot, chat_id: int):
+        try:
+            members = await bot.get_chat_administrators(chat_id)
+        except TelegramForbiddenError:
+            admins = None
+        except TelegramAPIError:
+            logger.exception("Failed to refresh admins of chat %s", chat_id)
+            chat = cls._chats.get(chat_id)
+
+            if chat is not None:
+                cls._set_chat_admins(chat_id, chat[0], time.monotonic())
+
+            return
         else:
-            await cls.service_delete_from_cart(session, user_id, product_id)
+            admins = frozenset(
+                member.user.id for member in members if member.status in ("creator", "administrator")
+            )
+
+        async with async_session_maker() as session:
+            await ChatAdminDAO.db_replace_chat_admins(session, chat_id, admins or set())
+            await session.commit()
+
+        chat = cls._chats.get(chat_id)
+        cls._set_chat_admins(chat_id, admins, time.monotonic())
+
+        if (chat[0] if chat is not None else None) != admins:
+            for hook in cls._invalidation_hooks:
+                hook()
+
+    @classmethod
+    def _schedule_refresh(cls, bot: Bot, chat_id: int) -> asyncio.Task:
+        task = cls._refreshing.get(chat_id)
+
+        if task is None:
+            task = asyncio.create_task(cls._refresh_chat(bot, chat_id))
+            cls._refreshing[chat_id] = task
+            task.add_done_callback(lambda _: cls._refreshing.pop(chat_id, None))
+
+        return task
+
+    @classmethod
+    async def service_refresh_chat(cls, bot: Bot, chat_id: int):
+        await asyncio.shield(cls._schedule_refresh(bot, chat_id))
+
+    @classmethod
+    def service_refresh_stale(cls, bot: Bot):
+        expired_at = time.monotonic() - cls.ttl
+
+        for chat_id, (_, fetched_at) in list(cls._chats.items()):
+            if fetched_at < expired_at:
+                cls._schedule_refresh(bot, chat_id)
+
+
+class SeedService:
+    @classmethod
+    async def service_apply_seed(
+            cls,
+            session: AsyncSession,
+            version: int,
+            banners: dict,
+            categories: list,
+            words: list | None = None
+    ):
+        await SeedVersionDAO.db_lock(session)
+
+        if await SeedVersionDAO.get_one(session, version=version):
+            await session.commit()
+            return False
+
+        await BannerService.service_add_banner(session, banners)
+        await CategoryService.service_create_categories(session, categories)
+        await RestrictedWordDAO.db_add_words(session, list(words or []))
+        session.add(SeedVersion(version=version))
 
         await session.commit()
 
+        BannerService.service_invalidate_cache()
+
         return True
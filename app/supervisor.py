@@ -0,0 +1,382 @@
+import asyncio
+import logging
+import multiprocessing
+import queue
+import signal
+import time
+from contextlib import suppress
+from contextvars import ContextVar
+from functools import partial
+
+import aiohttp
+from aiohttp import web
+
+from app.config import settings
+from app.database import async_session_maker
+from app.main import bot, dp, outbound, setup_dispatcher, collect_stats
+from app.models.services import CatalogService, BannerService, AdminService
+from app.webhook import verify_secret
+
+logger = logging.getLogger(__name__)
+
+POLLING_TIMEOUT = 30
+SHUTDOWN = None
+
+_remote_invalidation: ContextVar[bool] = ContextVar("remote_invalidation", default=False)
+
+
+def get_shard_key(update: dict) -> int:
+    for name, event in update.items():
+        if not isinstance(event, dict):
+            continue
+
+        user = event.get("from") or event.get("user")
+
+        if user:
+            return user["id"]
+
+        chat = event.get("chat") or (event.get("message") or {}).get("chat")
+
+        if chat:
+            return chat["id"]
+
+    return update["update_id"]
+
+
+def merge_stats(items: list[dict]) -> dict:
+    result = {}
+
+    for key in dict.fromkeys(key for item in items for key in item):
+        values = [item[key] for item in items if key in item]
+
+        if isinstance(values[0], dict):
+            result[key] = merge_stats(values)
+        elif key.startswith("max"):
+            result[key] = max(values)
+        elif key == "avg":
+            result[key] = sum(values) / len(values)
+        else:
+            result[key] = sum(values)
+
+    return result
+
+
+class Worker:
+    def __init__(self, index: int, workers: int, updates: multiprocessing.Queue, events: multiprocessing.Queue):
+        self.index = index
+        self.workers = workers
+        self.updates = updates
+        self.events = events
+
+    def publish_invalidation(self, kind: str):
+        if not _remote_invalidation.get():
+            self.events.put(("invalidate", self.index, kind))
+
+    async def apply_invalidation(self, kind: str):
+        _remote_invalidation.set(True)
+
+        if kind == "catalog":
+            async with async_session_maker() as session:
+                await CatalogService.service_refresh_catalog(session)
+        elif kind == "banners":
+            BannerService.service_invalidate_cache()
+        elif kind == "admins":
+            async with async_session_maker() as session:
+                await AdminService.service_load_admins(session, fetched_at=time.monotonic())
+
+    def send_stats(self):
+        self.events.put(("stats", self.index, collect_stats()))
+
+    async def _report_stats(self):
+        while True:
+            await asyncio.sleep(settings.WORKER_STATS_INTERVAL)
+            self.send_stats()
+
+    def _get_messages(self) -> list:
+        messages = [self.updates.get()]
+
+        with suppress(queue.Empty):
+            while messages[-1] is not SHUTDOWN:
+                messages.append(self.updates.get_nowait())
+
+        return messages
+
+    async def _handle(self, message) -> bool:
+        if message is SHUTDOWN:
+            return False
+
+        kind, payload = message
+
+        try:
+            if kind == "update":
+                await dp.feed_raw_update(bot, payload)
+            else:
+                await asyncio.create_task(self.apply_invalidation(payload))
+        except Exception:
+            logger.exception("Worker %s failed to handle %s message", self.index, kind)
+
+        return True
+
+    async def run(self):
+        outbound.set_global_rate(settings.OUTBOUND_GLOBAL_RATE / self.workers)
+        dp["worker"] = f"{self.index + 1}/{self.workers}"
+        setup_dispatcher()
+        await dp.emit_startup(bot=bot)
+
+        CatalogService.service_add_invalidation_hook(partial(self.publish_invalidation, "catalog"))
+        BannerService.service_add_invalidation_hook(partial(self.publish_invalidation, "banners"))
+        AdminService.service_add_invalidation_hook(partial(self.publish_invalidation, "admins"))
+
+        reporter = asyncio.create_task(self._report_stats())
+
+        try:
+            running = True
+
+            while running:
+                for message in await asyncio.to_thread(self._get_messages):
+                    running = await self._handle(message)
+        finally:
+            reporter.cancel()
+
+            with suppress(asyncio.CancelledError):
+                await reporter
+
+            await dp.emit_shutdown(bot=bot)
+            self.send_stats()
+            await bot.session.close()
+
+
+def run_worker(index: int, workers: int, updates: multiprocessing.Queue, events: multiprocessing.Queue):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    asyncio.run(Worker(index, workers, updates, events).run())
+
+
+class Supervisor:
+    def __init__(self, workers: int, max_pending: int = 1000, drain_timeout: float = 30):
+        self.workers = workers
+        self.drain_timeout = drain_timeout
+
+        self._context = multiprocessing.get_context("spawn")
+        self._queues = [self._context.Queue(maxsize=max_pending) for _ in range(workers)]
+        self._events = self._context.Queue()
+        self._processes: list[multiprocessing.Process | None] = [None] * workers
+        self._worker_stats: dict[int, dict] = {}
+        self._offset: int | None = None
+        self._stopping = False
+
+        self.routed = 0
+        self.backpressure_waits = 0
+        self.restarts = 0
+        self.invalidations = 0
+
+    def _start_worker(self, index: int):
+        process = self._context.Process(
+            target=run_worker,
+            args=(index, self.workers, self._queues[index], self._events),
+            name=f"bot-worker-{index}"
+        )
+        process.start()
+        self._processes[index] = process
+
+    async def _put(self, index: int, message):
+        worker_queue = self._queues[index]
+
+        try:
+            worker_queue.put_nowait(message)
+        except queue.Full:
+            self.backpressure_waits += 1
+            await asyncio.to_thread(worker_queue.put, message)
+
+    async def route(self, update: dict):
+        await self._put(get_shard_key(update) % self.workers, ("update", update))
+        self.routed += 1
+
+    async def _read_events(self):
+        while True:
+            try:
+                kind, index, payload = await asyncio.to_thread(self._events.get, timeout=1)
+            except queue.Empty:
+                continue
+
+            if kind == "stats":
+                self._worker_stats[index] = payload
+            elif kind == "invalidate":
+                self.invalidations += 1
+
+                for other in range(self.workers):
+                    if other != index:
+                        await self._put(other, ("invalidate", payload))
+
+    async def _monitor(self):
+        reported_at = time.monotonic()
+
+        while True:
+            await asyncio.sleep(1)
+
+            for index, process in enumerate(self._processes):
+                if not self._stopping and not process.is_alive():
+                    logger.error("Worker %s exited with code %s, restarting", index, process.exitcode)
+                    self.restarts += 1
+                    self._start_worker(index)
+
+            if time.monotonic() - reported_at >= settings.WORKER_STATS_INTERVAL:
+                reported_at = time.monotonic()
+                logger.info("Workers stats: %s", self.stats())
+
+    async def _get_updates(self, session: aiohttp.ClientSession, **params) -> list[dict]:
+        url = bot.session.api.api_url(token=bot.token, method="getUpdates")
+        params = {key: value for key, value in params.items() if value is not None}
+
+        async with session.post(url, json=params, timeout=aiohttp.ClientTimeout(total=POLLING_TIMEOUT + 10)) as response:
+            result = await response.json()
+
+        if not result.get("ok"):
+            retry_after = result.get("parameters", {}).get("retry_after", 1)
+            logger.error("getUpdates failed: %s, retrying in %s s", result.get("description"), retry_after)
+            await asyncio.sleep(retry_after)
+            return []
+
+        return result["result"]
+
+    async def _poll(self, allowed_updates: list[str]):
+        session = await bot.session.create_session()
+
+        while True:
+            try:
+                updates = await self._get_updates(
+                    session, offset=self._offset, timeout=POLLING_TIMEOUT, allowed_updates=allowed_updates
+                )
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                logger.exception("Failed to fetch updates")
+                await asyncio.sleep(1)
+                continue
+
+            for update in updates:
+                await self.route(update)
+                self._offset = update["update_id"] + 1
+
+    async def _confirm_offset(self):
+        if self._offset is None:
+            return
+
+        try:
+            session = await bot.session.create_session()
+            await self._get_updates(session, offset=self._offset, timeout=0, limit=1)
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            logger.exception("Failed to confirm updates offset %s", self._offset)
+
+    async def handle_webhook(self, request: web.Request) -> web.Response:
+        if not verify_secret(request, settings.WEBHOOK_SECRET):
+            return web.Response(body="Unauthorized", status=401)
+
+        await self.route(await request.json())
+
+        return web.Response()
+
+    async def _start_webhook(self, allowed_updates: list[str]) -> web.AppRunner:
+        app = web.Application()
+        app.router.add_post(settings.WEBHOOK_PATH, self.handle_webhook)
+
+        runner = web.AppRunner(app)
+        await runner.setup()
+
+        site = web.TCPSite(runner, host=settings.WEBHOOK_HOST, port=settings.WEBHOOK_PORT)
+        await site.start()
+
+        await bot.set_webhook(
+            url=f"{settings.WEBHOOK_URL}{settings.WEBHOOK_PATH}",
+            secret_token=settings.WEBHOOK_SECRET,
+            allowed_updates=allowed_updates,
+            drop_pending_updates=True
+        )
+
+        return runner
+
+    async def drain(self):
+        self._stopping = True
+
+        for index in range(self.workers):
+            await self._put(index, SHUTDOWN)
+
+        deadline = time.monotonic() + self.drain_timeout
+
+        for index, process in enumerate(self._processes):
+            await asyncio.to_thread(process.join, max(0.0, deadline - time.monotonic()))
+
+            if process.is_alive():
+                logger.error("Worker %s did not drain in %s s, terminating", index, self.drain_timeout)
+                process.terminate()
+
+    async def run(self):
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(sig, stop.set)
+
+        for index in range(self.workers):
+            self._start_worker(index)
+
+        allowed_updates = dp.resolve_used_update_types()
+        tasks = [asyncio.create_task(self._read_events()), asyncio.create_task(self._monitor())]
+        runner = None
+
+        if settings.MODE == "webhook":
+            runner = await self._start_webhook(allowed_updates)
+        else:
+            await bot.delete_webhook(drop_pending_updates=True)
+            poller = asyncio.create_task(self._poll(allowed_updates))
+
+        await stop.wait()
+
+        if runner is not None:
+            await runner.cleanup()
+        else:
+            poller.cancel()
+
+            with suppress(asyncio.CancelledError):
+                await poller
+
+            await self._confirm_offset()
+
+        await self.drain()
+
+        for task in tasks:
+            task.cancel()
+
+            with suppress(asyncio.CancelledError):
+                await task
+
+        with suppress(queue.Empty):
+            while True:
+                kind, index, payload = self._events.get_nowait()
+
+                if kind == "stats":
+                    self._worker_stats[index] = payload
+
+        logger.info("Workers stats: %s", self.stats())
+        await bot.session.close()
+
+    def stats(self):
+        return {
+            "workers": {
+                "count": self.workers,
+                "alive": sum(process.is_alive() for process in self._processes if process is not None),
+                "restarts": self.restarts
+            },
+            "routed": self.routed,
+            "backpressure_waits": self.backpressure_waits,
+            "invalidations": self.invalidations,
+            **merge_stats(list(self._worker_stats.values()))
+        }
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+
+    supervisor = Supervisor(
+        workers=settings.WORKERS,
+        max_pending=settings.UPDATES_MAX_PENDING,
+        drain_timeout=settings.WORKER_DRAIN_TIMEOUT
+    )
+    asyncio.run(supervisor.run())
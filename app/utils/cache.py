@@ -0,0 +1,84 @@
+import time
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUCache:
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        if key not in self._data:
+            self.misses += 1
+            return default
+
+        self.hits += 1
+        self._data.move_to_end(key)
+
+        return self._data[key]
+
+    def set(self, key, value):
+        self._data[key] = value
+        self._data.move_to_end(key)
+
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def pop(self, key, default=None):
+        return self._data.pop(key, default)
+
+    def clear(self):
+        self._data.clear()
+
+    def stats(self):
+        return {"size": len(self._data), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+class TTLCache(LRUCache):
+    def __init__(self, maxsize: int = 1024, ttl: float = 300):
+        super().__init__(maxsize=maxsize)
+        self.ttl = ttl
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING, count=False) is not _MISSING
+
+    def get(self, key, default=None, count: bool = True):
+        item = self._data.get(key)
+
+        if item is None or item[1] < time.monotonic():
+            if item is not None:
+                del self._data[key]
+
+            if count:
+                self.misses += 1
+
+            return default
+
+        if count:
+            self.hits += 1
+
+        self._data.move_to_end(key)
+
+        return item[0]
+
+    def set(self, key, value):
+        super().set(key, (value, time.monotonic() + self.ttl))
+
+    def pop(self, key, default=None):
+        item = self._data.pop(key, None)
+        return default if item is None else item[0]
+
+    def stats(self):
+        return {**super().stats(), "ttl": self.ttl}
+
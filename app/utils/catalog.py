@@ -0,0 +1,51 @@
+from decimal import Decimal
+from types import MappingProxyType
+from typing import NamedTuple
+
+
+class CategoryItem(NamedTuple):
+    id: int
+    name: str
+
+
+class ProductItem(NamedTuple):
+    id: int
+    name: str
+    description: str
+    price: Decimal
+    image: str
+    category_id: int
+
+
+class CatalogSnapshot:
+    __slots__ = ("version", "categories", "products", "products_by_category")
+
+    def __init__(self, version: int, categories: list, products: list):
+        self.version = version
+        self.categories = tuple(CategoryItem(id=category.id, name=category.name) for category in categories)
+
+        by_id = {}
+        by_category = {category.id: [] for category in self.categories}
+
+        for product in sorted(products, key=lambda product: product.id):
+            item = ProductItem(
+                id=product.id,
+                name=product.name,
+                description=product.description,
+                price=product.price,
+                image=product.image,
+                category_id=product.category_id
+            )
+            by_id[item.id] = item
+            by_category.setdefault(item.category_id, []).append(item)
+
+        self.products = MappingProxyType(by_id)
+        self.products_by_category = MappingProxyType(
+            {category_id: tuple(items) for category_id, items in by_category.items()}
+        )
+
+    def get_products(self, category_id: int) -> tuple[ProductItem, ...]:
+        return self.products_by_category.get(category_id, ())
+
+    def get_product(self, product_id: int) -> ProductItem | None:
+        return self.products.get(product_id)
@@ -0,0 +1,58 @@
+import csv
+import io
+import json
+from decimal import Decimal, InvalidOperation
+from pathlib import PurePath
+from typing import Iterable, Iterator
+
+CATALOG_FORMATS = ("csv", "jsonl")
+CATALOG_COLUMNS = ("name", "description", "price", "image", "category")
+
+
+def get_catalog_format(filename: str | None) -> str:
+    catalog_format = PurePath(filename or "").suffix.lstrip(".").lower()
+
+    if catalog_format not in CATALOG_FORMATS:
+        raise ValueError(f"Unsupported catalog file {filename!r}, expected one of: {', '.join(CATALOG_FORMATS)}")
+
+    return catalog_format
+
+
+def read_catalog_records(lines: Iterable[str], catalog_format: str) -> Iterator[tuple]:
+    if catalog_format == "csv":
+        rows = csv.DictReader(lines)
+    else:
+        rows = (json.loads(line) for line in lines if line.strip())
+
+    for number, row in enumerate(rows, start=1):
+        try:
+            yield (
+                number,
+                row["name"].strip(),
+                (row.get("description") or "").strip(),
+                Decimal(str(row["price"]).strip()),
+                row["image"].strip(),
+                row["category"].strip()
+            )
+        except (KeyError, AttributeError, InvalidOperation) as e:
+            raise ValueError(f"Invalid catalog row {number}: {e!r}") from e
+
+
+def write_catalog_records(rows: Iterable, catalog_format: str, header: bool = False) -> str:
+    output = io.StringIO()
+
+    if catalog_format == "csv":
+        writer = csv.writer(output)
+
+        if header:
+            writer.writerow(CATALOG_COLUMNS)
+
+        writer.writerows(rows)
+    else:
+        for row in rows:
+            record = dict(zip(CATALOG_COLUMNS, row))
+            record["price"] = str(record["price"])
+            output.write(json.dumps(record, ensure_ascii=False))
+            output.write("\n")
+
+    return output.getvalue()
@@ -0,0 +1,104 @@
+import re
+from collections import deque
+from typing import Iterable
+
+WORD_RE = re.compile(r"[0-9a-zа-яё]+")
+
+MIN_STEM_LENGTH = 3
+
+ENDINGS = (
+    "ами", "ями", "ого", "его", "ому", "ему", "ыми", "ими", "ых", "их",
+    "ах", "ях", "ам", "ям", "ов", "ев", "ой", "ей", "ий", "ый", "ая", "яя",
+    "ое", "ее", "ые", "ие", "ом", "ем", "ую", "юю",
+    "у", "ю", "а", "я", "о", "е", "ы", "и", "ь", "й",
+)
+ENDINGS_BY_LENGTH = tuple(
+    (length, frozenset(ending for ending in ENDINGS if len(ending) == length))
+    for length in sorted({len(ending) for ending in ENDINGS}, reverse=True)
+)
+
+
+def normalize_word(word: str) -> str:
+    word = word.replace("ё", "е")
+
+    for length, endings in ENDINGS_BY_LENGTH:
+        if len(word) - length >= MIN_STEM_LENGTH and word[-length:] in endings:
+            return word[:-length]
+
+    return word
+
+
+def normalize_text(text: str) -> list[str]:
+    return [normalize_word(word) for word in WORD_RE.findall(text.lower())]
+
+
+class ModerationEngine:
+    def __init__(self, words: Iterable[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._output: list[str | None] = [None]
+
+        self.size = 0
+
+        for word in words:
+            pattern = normalize_text(word)
+
+            if pattern:
+                self._add(pattern, word)
+
+        self._build()
+
+    def _add(self, pattern: list[str], word: str):
+        node = 0
+
+        for stem in pattern:
+            next_node = self._goto[node].get(stem)
+
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][stem] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+
+            node = next_node
+
+        if self._output[node] is None:
+            self.size += 1
+
+        self._output[node] = word
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+
+        while queue:
+            node = queue.popleft()
+
+            for stem, child in self._goto[node].items():
+                queue.append(child)
+
+                if node:
+                    fail = self._fail[node]
+
+                    while fail and stem not in self._goto[fail]:
+                        fail = self._fail[fail]
+
+                    self._fail[child] = self._goto[fail].get(stem, 0)
+
+                if self._output[child] is None:
+                    self._output[child] = self._output[self._fail[child]]
+
+    def find(self, text: str) -> str | None:
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+
+        for stem in normalize_text(text):
+            while node and stem not in goto[node]:
+                node = fail[node]
+
+            node = goto[node].get(stem, 0)
+
+            if output[node] is not None:
+                return output[node]
+
+        return None
@@ -1,13 +1,17 @@
 import math
 
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
 
 class Paginator:
-    def __init__(self, array: list | tuple, page: int = 1, per_page: int = 1):
+    def __init__(self, array: list | tuple, page: int = 1, per_page: int = 1, aggregates: dict | None = None):
         self.array = array
         self.per_page = per_page
         self.page = page
         self.len = len(self.array)
         self.pages = math.ceil(self.len / self.per_page)
+        self.aggregates = aggregates or {}
 
     def __get_slice(self):
         start = (self.page - 1) * self.per_page
@@ -30,3 +34,44 @@ class Paginator:
         if self.page > 1:
             return self.page - 1
         return False
+
+
+class QueryPaginator(Paginator):
+    def __init__(self, query: Select, page: int = 1, per_page: int = 1, aggregates: dict | None = None):
+        super().__init__((), page=max(page, 1), per_page=per_page)
+        self.query = query
+        self.aggregates_columns = aggregates or {}
+        self.aggregates = dict.fromkeys(self.aggregates_columns)
+
+    async def fetch(self, session: AsyncSession):
+        query = (
+            self.query
+            .add_columns(
+                func.count().over().label("total_count"),
+                *(column.over().label(name) for name, column in self.aggregates_columns.items())
+            )
+            .limit(self.per_page)
+            .offset((self.page - 1) * self.per_page)
+        )
+        rows = (await session.execute(query)).all()
+
+        if rows:
+            self.len = rows[0].total_count
+            self.aggregates = {name: getattr(rows[0], name) for name in self.aggregates_columns}
+        elif self.page > 1:
+            count_query = select(func.count()).select_from(self.query.order_by(None).subquery())
+            self.len = (await session.execute(count_query)).scalar_one()
+        else:
+            self.len = 0
+
+        self.array = [row[0] for row in rows]
+        self.pages = math.ceil(self.len / self.per_page)
+
+        if not rows and self.len:
+            self.page = self.pages
+            return await self.fetch(session)
+
+        return self
+
+    def get_page(self):
+        return self.array
@@ -0,0 +1,55 @@
+import bisect
+import time
+
+from sqlalchemy.exc import TimeoutError
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+CHECKOUT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+
+        self.waiting = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.max_checkout_time = 0.0
+        self.total_checkout_time = 0.0
+        self.checkout_histogram = [0] * (len(CHECKOUT_BUCKETS) + 1)
+
+    def connect(self):
+        self.waiting += 1
+        started_at = time.perf_counter()
+
+        try:
+            return super().connect()
+        except TimeoutError:
+            self.timeouts += 1
+            raise
+        finally:
+            self.waiting -= 1
+            elapsed = time.perf_counter() - started_at
+
+            self.checkouts += 1
+            self.total_checkout_time += elapsed
+            self.max_checkout_time = max(self.max_checkout_time, elapsed)
+            self.checkout_histogram[bisect.bisect_left(CHECKOUT_BUCKETS, elapsed)] += 1
+
+    def stats(self):
+        buckets = [f"le_{bucket}" for bucket in CHECKOUT_BUCKETS] + ["le_inf"]
+
+        return {
+            "size": self.size(),
+            "checked_out": self.checkedout(),
+            "checked_in": self.checkedin(),
+            "overflow": max(self.overflow(), 0),
+            "waiting": self.waiting,
+            "checkouts": self.checkouts,
+            "timeouts": self.timeouts,
+            "checkout_time": {
+                "avg": self.total_checkout_time / self.checkouts if self.checkouts else 0,
+                "max": self.max_checkout_time,
+                "histogram": dict(zip(buckets, self.checkout_histogram))
+            }
+        }
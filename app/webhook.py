@@ -0,0 +1,100 @@
+import asyncio
+import logging
+from secrets import compare_digest
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+from aiogram.webhook.aiohttp_server import setup_application
+from aiohttp import web
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def verify_secret(request: web.Request, secret_token: str | None) -> bool:
+    if not secret_token:
+        return True
+
+    return compare_digest(request.headers.get("X-Telegram-Bot-Api-Secret-Token", ""), secret_token)
+
+
+class WebhookHandler:
+    def __init__(self, dispatcher: Dispatcher, bot: Bot, secret_token: str | None = None, max_concurrency: int = 100):
+        self.dispatcher = dispatcher
+        self.bot = bot
+        self.secret_token = secret_token
+
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._tasks: set[asyncio.Task] = set()
+
+        self.received = 0
+        self.rejected = 0
+
+    async def handle(self, request: web.Request) -> web.Response:
+        if not verify_secret(request, self.secret_token):
+            self.rejected += 1
+            return web.Response(body="Unauthorized", status=401)
+
+        update = Update.model_validate(await request.json(), context={"bot": self.bot})
+        self.received += 1
+
+        task = asyncio.create_task(self._process(update))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+        return web.Response()
+
+    async def _process(self, update: Update):
+        async with self._semaphore:
+            try:
+                await self.dispatcher.feed_update(self.bot, update)
+            except Exception:
+                logger.exception("Failed to process update %s", update.update_id)
+
+    async def drain(self, *args):
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self):
+        return {"received": self.received, "rejected": self.rejected, "in_flight": len(self._tasks)}
+
+
+def create_webhook_app(dispatcher: Dispatcher, bot: Bot) -> web.Application:
+    handler = WebhookHandler(
+        dispatcher,
+        bot,
+        secret_token=settings.WEBHOOK_SECRET,
+        max_concurrency=settings.WEBHOOK_MAX_CONCURRENCY
+    )
+
+    app = web.Application()
+    app["webhook_handler"] = handler
+    app.router.add_post(settings.WEBHOOK_PATH, handler.handle)
+    app.on_shutdown.append(handler.drain)
+
+    setup_application(app, dispatcher, bot=bot)
+
+    return app
+
+
+async def run_webhook(dispatcher: Dispatcher, bot: Bot):
+    app = create_webhook_app(dispatcher, bot)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+
+    site = web.TCPSite(runner, host=settings.WEBHOOK_HOST, port=settings.WEBHOOK_PORT)
+    await site.start()
+
+    await bot.set_webhook(
+        url=f"{settings.WEBHOOK_URL}{settings.WEBHOOK_PATH}",
+        secret_token=settings.WEBHOOK_SECRET,
+        allowed_updates=dispatcher.resolve_used_update_types(),
+        drop_pending_updates=True
+    )
+
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
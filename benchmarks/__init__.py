@@ -0,0 +1,11 @@
+import os
+
+for name, value in {
+    "TOKEN": "123456:benchmark",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_USER": "postgres",
+    "DB_PASS": "postgres",
+    "DB_NAME": "postgres"
+}.items():
+    os.environ.setdefault(name, value)
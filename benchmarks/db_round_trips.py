@@ -0,0 +1,157 @@
+import argparse
+import asyncio
+import itertools
+import time
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from sqlalchemy import event
+
+from app.common.texts_for_db import description_for_info_pages
+from app.database import Base, async_session_maker, engine
+from app.keyboards.inline import MenuCallback
+from app.main import dp, on_startup
+from app.middlewares.db import DataBaseSession
+from app.models.models import Banner, Category, Product
+
+
+class NullSession(BaseSession):
+    async def make_request(self, bot, method, timeout=None):
+        return None
+
+    async def stream_content(self, url, headers=None, timeout=30, chunk_size=65536, raise_for_status=True):
+        yield b""
+
+    async def close(self):
+        pass
+
+
+class RoundTripCounter:
+    def __init__(self):
+        self.statements = 0
+        self.commits = 0
+
+    def _on_statement(self, *args):
+        self.statements += 1
+
+    def _on_commit(self, *args):
+        self.commits += 1
+
+    def listen(self):
+        event.listen(engine.sync_engine, "before_cursor_execute", self._on_statement)
+        event.listen(engine.sync_engine, "commit", self._on_commit)
+
+    def reset(self):
+        self.statements = 0
+        self.commits = 0
+
+
+def make_message(update_id: int, user_id: int, text: str) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "date": int(time.time()),
+            "chat": {"id": user_id, "type": "private"},
+            "from": {"id": user_id, "is_bot": False, "first_name": "User"},
+            "text": text
+        }
+    }
+
+
+def make_callback(update_id: int, user_id: int, callback_data: MenuCallback) -> dict:
+    user = {"id": user_id, "is_bot": False, "first_name": "User"}
+
+    return {
+        "update_id": update_id,
+        "callback_query": {
+            "id": str(update_id),
+            "from": user,
+            "chat_instance": str(user_id),
+            "data": callback_data.pack(),
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": user_id, "type": "private"},
+                "from": user,
+                "photo": [{"file_id": "photo", "file_unique_id": "photo", "width": 1, "height": 1}]
+            }
+        }
+    }
+
+
+async def seed_catalog() -> int:
+    async with async_session_maker() as session:
+        session.add_all(Banner(name=name, image="banner") for name in description_for_info_pages)
+
+        category = Category(name="Benchmark")
+        session.add(category)
+        await session.flush()
+
+        product = Product(name="Benchmark", description="", price=1, image="image", category_id=category.id)
+        session.add(product)
+        await session.commit()
+
+    return product.id
+
+
+def setup_dispatcher():
+    dp.startup.register(on_startup)
+    dp.update.middleware(DataBaseSession(session_pool=async_session_maker))
+
+
+async def main(args: argparse.Namespace):
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+
+    product_id = await seed_catalog()
+
+    bot = Bot("123456:benchmark", session=NullSession())
+    setup_dispatcher()
+    await dp.emit_startup(bot=bot)
+
+    samples = {
+        "/start": lambda update_id, user_id: make_message(update_id, user_id, "/start"),
+        "catalog": lambda update_id, user_id: make_callback(
+            update_id, user_id, MenuCallback(level=1, menu_name="catalog")
+        ),
+        "add_to_cart": lambda update_id, user_id: make_callback(
+            update_id, user_id, MenuCallback(level=3, menu_name="add_to_cart", product_id=product_id)
+        ),
+        "cart": lambda update_id, user_id: make_callback(
+            update_id, user_id, MenuCallback(level=3, menu_name="cart", page=1)
+        )
+    }
+
+    counter = RoundTripCounter()
+    counter.listen()
+    update_ids = itertools.count(1)
+
+    try:
+        for name, make_update in samples.items():
+            statements = commits = 0
+
+            for user_id in range(1, args.updates + 1):
+                counter.reset()
+                await dp.feed_raw_update(bot, make_update(next(update_ids), user_id))
+
+                statements += counter.statements
+                commits += counter.commits
+
+            print(
+                f"{name}: {statements / args.updates:.2f} statements, "
+                f"{commits / args.updates:.2f} commits per update"
+            )
+    finally:
+        await dp.emit_shutdown(bot=bot)
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Count DB round trips per update, the schema of the configured database is recreated"
+    )
+    parser.add_argument("--updates", type=int, default=100)
+
+    asyncio.run(main(parser.parse_args()))
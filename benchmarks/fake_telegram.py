@@ -0,0 +1,167 @@
+import asyncio
+import itertools
+import json
+import time
+
+import aiohttp
+from aiohttp import web
+
+BOT_USER = {"id": 123456, "is_bot": True, "first_name": "Benchmark", "username": "benchmark_bot"}
+REPLY_METHODS = ("sendmessage", "sendphoto", "editmessagemedia", "editmessagetext")
+
+
+class FakeTelegram:
+    def __init__(self, users: int = 1000, webhook_connections: int = 40):
+        self.users = users
+        self.webhook_connections = webhook_connections
+
+        self._updates: list[dict] = []
+        self._update_ids = itertools.count(1)
+        self._message_ids = itertools.count(1)
+        self._new_updates = asyncio.Event()
+        self._webhook: tuple[str, str | None] | None = None
+        self._pusher: asyncio.Task | None = None
+        self._runner: web.AppRunner | None = None
+
+        self.calls: dict[str, int] = {}
+        self.replies = 0
+        self.replied = asyncio.Event()
+        self.expected_replies = 0
+        self.floods: dict[int, list[int]] = {}
+
+    def make_update(self, number: int) -> dict:
+        update_id = next(self._update_ids)
+        user = {"id": number % self.users + 1, "is_bot": False, "first_name": "User"}
+
+        return {
+            "update_id": update_id,
+            "message": {
+                "message_id": update_id,
+                "date": int(time.time()),
+                "chat": {"id": user["id"], "type": "private"},
+                "from": user,
+                "text": f"message {number}"
+            }
+        }
+
+    def enqueue(self, count: int):
+        self.replies = 0
+        self.expected_replies = count
+        self.replied.clear()
+
+        self._updates.extend(self.make_update(number) for number in range(count))
+        self._new_updates.set()
+
+    def flood(self, chat_id: int, retry_after: int, count: int = 1):
+        self.floods[chat_id] = [retry_after, count]
+
+    def _get_updates(self, offset: int, limit: int) -> list[dict]:
+        self._updates = [update for update in self._updates if update["update_id"] >= offset]
+        return self._updates[:limit]
+
+    async def _push_webhook(self):
+        url, secret = self._webhook
+        headers = {"X-Telegram-Bot-Api-Secret-Token": secret} if secret else {}
+        semaphore = asyncio.Semaphore(self.webhook_connections)
+
+        async def push(session: aiohttp.ClientSession, update: dict):
+            async with semaphore:
+                async with session.post(url, json=update, headers=headers) as response:
+                    await response.read()
+
+        async with aiohttp.ClientSession() as session:
+            while True:
+                await self._new_updates.wait()
+                self._new_updates.clear()
+
+                updates, self._updates = self._updates, []
+                await asyncio.gather(*(push(session, update) for update in updates))
+
+    def _result(self, method: str, params: dict):
+        if method == "getme":
+            return BOT_USER
+
+        if method in REPLY_METHODS:
+            self.replies += 1
+
+            if self.replies >= self.expected_replies:
+                self.replied.set()
+
+            return {
+                "message_id": next(self._message_ids),
+                "date": int(time.time()),
+                "chat": {"id": int(params.get("chat_id", 0)), "type": "private"},
+                "from": BOT_USER,
+                "text": params.get("text", "")
+            }
+
+        if method == "setwebhook":
+            self._webhook = (params["url"], params.get("secret_token"))
+
+            if self._pusher is None:
+                self._pusher = asyncio.create_task(self._push_webhook())
+
+        if method == "deletewebhook":
+            self._webhook = None
+
+            if self._pusher is not None:
+                self._pusher.cancel()
+                self._pusher = None
+
+        return True
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"].lower()
+        params = dict(await request.post()) if request.can_read_body else {}
+        self.calls[method] = self.calls.get(method, 0) + 1
+
+        if method == "getupdates":
+            offset = int(params.get("offset", 0))
+            limit = int(params.get("limit", 100))
+            updates = self._get_updates(offset, limit)
+
+            if not updates:
+                self._new_updates.clear()
+
+                try:
+                    await asyncio.wait_for(self._new_updates.wait(), float(params.get("timeout", 0)))
+                except asyncio.TimeoutError:
+                    pass
+
+                updates = self._get_updates(offset, limit)
+
+            return web.json_response({"ok": True, "result": updates}, dumps=json.dumps)
+
+        flood = self.floods.get(int(params.get("chat_id", 0))) if method in REPLY_METHODS else None
+
+        if flood is not None and flood[1] > 0:
+            flood[1] -= 1
+
+            return web.json_response(
+                {
+                    "ok": False,
+                    "error_code": 429,
+                    "description": f"Too Many Requests: retry after {flood[0]}",
+                    "parameters": {"retry_after": flood[0]}
+                },
+                status=429
+            )
+
+        return web.json_response({"ok": True, "result": self._result(method, params)})
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8081) -> str:
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self.handle)
+
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host=host, port=port).start()
+
+        return f"http://{host}:{port}"
+
+    async def stop(self):
+        if self._pusher is not None:
+            self._pusher.cancel()
+
+        if self._runner is not None:
+            await self._runner.cleanup()
@@ -0,0 +1,60 @@
+import argparse
+import timeit
+from types import SimpleNamespace
+
+from app.keyboards.inline import (
+    get_user_main_btns,
+    get_user_catalog_btns,
+    get_products_btns,
+    get_user_cart,
+    _get_user_catalog_btns,
+    _get_products_btns,
+    _get_user_cart
+)
+
+CATEGORIES = [SimpleNamespace(id=index, name=f"Category {index}") for index in range(1, 9)]
+PAGINATION = {"◀ Пред.": "previous", "След. ▶": "next"}
+
+CASES = {
+    "main": (
+        lambda: get_user_main_btns.__wrapped__(level=0, sizes=(2,)),
+        lambda: get_user_main_btns(level=0)
+    ),
+    "catalog": (
+        lambda: _get_user_catalog_btns.__wrapped__(
+            level=1, categories=tuple((category.id, category.name) for category in CATEGORIES), sizes=(2,)
+        ),
+        lambda: get_user_catalog_btns(level=1, categories=CATEGORIES)
+    ),
+    "products": (
+        lambda: _get_products_btns.__wrapped__(
+            level=2, category=1, page=2, pagination_btns=tuple(PAGINATION.items()), product_id=10, sizes=(2, 1)
+        ),
+        lambda: get_products_btns(level=2, category=1, page=2, pagination_btns=PAGINATION, product_id=10)
+    ),
+    "cart": (
+        lambda: _get_user_cart.__wrapped__(
+            level=3, page=2, pagination_btns=tuple(PAGINATION.items()), product_id=10, sizes=(3,)
+        ),
+        lambda: get_user_cart(level=3, page=2, pagination_btns=PAGINATION, product_id=10)
+    )
+}
+
+
+def measure(function, number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def main(args: argparse.Namespace):
+    for name, (build, cached) in CASES.items():
+        built = measure(build, args.number)
+        hit = measure(cached, args.number)
+
+        print(f"{name}: {built * 1e6:.1f} us built, {hit * 1e6:.1f} us cached, {built / hit:.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare per-call cost of built and memoized keyboards")
+    parser.add_argument("--number", type=int, default=2000)
+
+    main(parser.parse_args())
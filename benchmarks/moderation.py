@@ -0,0 +1,60 @@
+import argparse
+import random
+import time
+
+from app.utils.moderation import ModerationEngine
+
+LETTERS = "абвгдежзийклмнопрстуфхцчшщыэюя"
+CONSONANTS = "бвгджзклмнпрстфхцчшщ"
+ENDINGS = ("", "а", "ы", "у", "ом", "ами", "ой", "ях")
+
+
+def make_word(rng: random.Random) -> str:
+    return "".join(rng.choices(LETTERS, k=rng.randint(3, 8)) + rng.choices(CONSONANTS, k=2))
+
+
+def make_messages(
+        rng: random.Random, words: list[str], count: int, length: int, hit_rate: float
+) -> tuple[list[str], int]:
+    vocabulary = [make_word(rng) for _ in range(5000)]
+    messages = []
+    planted = 0
+
+    for _ in range(count):
+        message = rng.choices(vocabulary, k=length)
+
+        if rng.random() < hit_rate:
+            message[rng.randrange(length)] = rng.choice(words) + rng.choice(ENDINGS)
+            planted += 1
+
+        messages.append(", ".join(message) + "!")
+
+    return messages, planted
+
+
+def main(args: argparse.Namespace):
+    rng = random.Random(args.seed)
+    words = list({make_word(rng) for _ in range(args.words)})
+    messages, planted = make_messages(rng, words, args.messages, args.length, args.hit_rate)
+
+    started_at = time.perf_counter()
+    engine = ModerationEngine(words)
+    built_in = time.perf_counter() - started_at
+
+    started_at = time.perf_counter()
+    hits = sum(engine.find(message) is not None for message in messages)
+    elapsed = time.perf_counter() - started_at
+
+    print(f"build: {len(words)} words in {built_in:.2f} s")
+    print(f"scan: {len(messages) / elapsed:.0f} messages/s, {hits} of {len(messages)} flagged, {planted} planted")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Measure moderation engine build time and scan throughput")
+    parser.add_argument("--words", type=int, default=50_000)
+    parser.add_argument("--messages", type=int, default=100_000)
+    parser.add_argument("--length", type=int, default=20, help="words per message")
+    parser.add_argument("--hit-rate", type=float, default=0.05)
+    parser.add_argument("--seed", type=int, default=0)
+
+    main(parser.parse_args())
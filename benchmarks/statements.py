@@ -0,0 +1,38 @@
+import argparse
+import timeit
+
+from sqlalchemy import select
+
+from app.dao.base import BaseDAO
+from app.models.dao import ProductDAO
+
+
+def build_statement(dao: type[BaseDAO], filter_by: dict):
+    statement = select(dao.model).filter_by(**filter_by)
+    return statement, statement._generate_cache_key()
+
+
+def cached_statement(dao: type[BaseDAO], filter_by: dict):
+    statement, params = dao.get_select_statement(filter_by)
+    return statement, statement._generate_cache_key(), params
+
+
+def measure(function, number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=5)) / number
+
+
+def main(args: argparse.Namespace):
+    filter_by = {"category_id": 1}
+
+    built = measure(lambda: build_statement(ProductDAO, filter_by), args.number)
+    cached = measure(lambda: cached_statement(ProductDAO, filter_by), args.number)
+
+    print(f"filter_by: {built * 1e6:.1f} us per query")
+    print(f"registry: {cached * 1e6:.1f} us per query, {built / cached:.0f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare statement building against the BaseDAO statement registry")
+    parser.add_argument("--number", type=int, default=5000)
+
+    main(parser.parse_args())
@@ -0,0 +1,87 @@
+import argparse
+import asyncio
+import time
+
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.types import Message
+from aiohttp import web
+
+from benchmarks.fake_telegram import FakeTelegram
+from app.config import settings
+from app.webhook import create_webhook_app
+
+async def echo(message: Message):
+    await message.answer(message.text)
+
+
+def create_dispatcher() -> Dispatcher:
+    dispatcher = Dispatcher()
+    dispatcher.message.register(echo)
+
+    return dispatcher
+
+
+async def run_polling(telegram: FakeTelegram, bot: Bot, dispatcher: Dispatcher, count: int) -> float:
+    polling = asyncio.create_task(dispatcher.start_polling(bot, handle_signals=False, close_bot_session=False))
+
+    started_at = time.perf_counter()
+    telegram.enqueue(count)
+    await telegram.replied.wait()
+    elapsed = time.perf_counter() - started_at
+
+    await dispatcher.stop_polling()
+    await polling
+
+    return elapsed
+
+
+async def run_webhook(telegram: FakeTelegram, bot: Bot, dispatcher: Dispatcher, count: int, port: int) -> float:
+    runner = web.AppRunner(create_webhook_app(dispatcher, bot))
+    await runner.setup()
+    await web.TCPSite(runner, host="127.0.0.1", port=port).start()
+
+    await bot.set_webhook(url=f"http://127.0.0.1:{port}{settings.WEBHOOK_PATH}", secret_token=settings.WEBHOOK_SECRET)
+
+    started_at = time.perf_counter()
+    telegram.enqueue(count)
+    await telegram.replied.wait()
+    elapsed = time.perf_counter() - started_at
+
+    await bot.delete_webhook()
+    await runner.cleanup()
+
+    return elapsed
+
+
+async def main(args: argparse.Namespace):
+    telegram = FakeTelegram(users=args.users, webhook_connections=args.connections)
+    url = await telegram.start(port=args.api_port)
+
+    try:
+        for mode in args.modes:
+            bot = Bot(settings.TOKEN, session=AiohttpSession(api=TelegramAPIServer.from_base(url)))
+            dispatcher = create_dispatcher()
+
+            if mode == "polling":
+                elapsed = await run_polling(telegram, bot, dispatcher, args.updates)
+            else:
+                elapsed = await run_webhook(telegram, bot, dispatcher, args.updates, args.webhook_port)
+
+            await bot.session.close()
+            print(f"{mode}: {args.updates} updates in {elapsed:.2f} s, {args.updates / elapsed:.0f} updates/s")
+    finally:
+        await telegram.stop()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare update throughput of webhook and polling modes")
+    parser.add_argument("--updates", type=int, default=5000)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--connections", type=int, default=40)
+    parser.add_argument("--api-port", type=int, default=8081)
+    parser.add_argument("--webhook-port", type=int, default=8082)
+    parser.add_argument("--modes", nargs="+", choices=["polling", "webhook"], default=["polling", "webhook"])
+
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,61 @@
+import asyncio
+import os
+
+import pytest
+
+for name, value in {
+    "TOKEN": "123456:test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "DB_USER": "postgres",
+    "DB_PASS": "postgres",
+    "DB_NAME": "postgres"
+}.items():
+    os.environ.setdefault(name, value)
+
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+
+from app.database import Base
+from app.models import models  # noqa: F401
+
+
+class RecordingSession:
+    def __init__(self, result=None):
+        self.result = result
+        self.statements = []
+
+    async def execute(self, statement, *args, **kwargs):
+        self.statements.append(str(statement.compile(dialect=postgresql.dialect())))
+        return self.result
+
+
+@pytest.fixture
+def database_url():
+    url = os.environ.get("DATABASE_URL")
+
+    if not url:
+        pytest.skip("DATABASE_URL is not set")
+
+    return url
+
+
+@pytest.fixture
+def run_with_database(database_url):
+    # The schema of DATABASE_URL is dropped and recreated, point it at a disposable database.
+    def run(scenario, pool_size: int = 20):
+        async def main():
+            engine = create_async_engine(database_url, pool_size=pool_size, max_overflow=0)
+
+            async with engine.begin() as connection:
+                await connection.run_sync(Base.metadata.drop_all)
+                await connection.run_sync(Base.metadata.create_all)
+
+            try:
+                return await scenario(async_sessionmaker(engine, expire_on_commit=False))
+            finally:
+                await engine.dispose()
+
+        return asyncio.run(main())
+
+    return run
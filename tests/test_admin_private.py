@@ -0,0 +1,48 @@
+import asyncio
+from unittest.mock import MagicMock
+
+import pytest
+from aiogram import Bot
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.types import CallbackQuery, User
+
+from app.handlers.admin_private import admin_router, pool_stats
+from app.keyboards.inline import AdminProductsCallback
+from app.models.services import AdminService
+
+
+@pytest.mark.parametrize("action", ["page", "overview"])
+def test_products_callbacks_require_admin(monkeypatch, action):
+    monkeypatch.setattr(AdminService, "_chats", {})
+    monkeypatch.setattr(AdminService, "_admins", frozenset({1}))
+
+    callback = CallbackQuery(
+        id="1",
+        from_user=User(id=2, is_bot=False, first_name="User"),
+        chat_instance="1",
+        data=AdminProductsCallback(action=action, category=1).pack()
+    )
+
+    async def scenario():
+        bot = Bot("123456:test")
+
+        try:
+            return await admin_router.propagate_event("callback_query", callback, bot=bot, session=MagicMock())
+        finally:
+            await bot.session.close()
+
+    assert asyncio.run(scenario()) is UNHANDLED
+
+
+@pytest.mark.parametrize("worker, scoped", [(None, False), ("2/4", True)])
+def test_pool_stats_are_labelled_per_worker(worker, scoped):
+    answers = []
+
+    class FakeMessage:
+        async def answer(self, text):
+            answers.append(text)
+
+    asyncio.run(pool_stats(FakeMessage(), worker=worker))
+
+    assert ("Только воркер 2/4" in answers[0]) is scoped
+    assert "Размер пула" in answers[0]
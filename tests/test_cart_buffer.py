@@ -0,0 +1,111 @@
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from app.config import settings
+from app.models import cart_buffer as cart_buffer_module, services
+from app.models.cart_buffer import CartWriteBehind
+from app.models.dao import CartDAO
+from app.models.services import CartService
+
+from tests.test_cart_dao import seed_cart_product
+
+
+class FakeCartDAO:
+    def __init__(self):
+        self.rows: dict[tuple[int, int], int] = {}
+        self.applying = asyncio.Event()
+        self.release = asyncio.Event()
+
+    async def db_get_user_carts(self, session, user_id):
+        return [
+            SimpleNamespace(product_id=product_id, quantity=quantity)
+            for (row_user_id, product_id), quantity in self.rows.items()
+            if row_user_id == user_id
+        ]
+
+    async def db_apply_deltas(self, session, deltas):
+        for delta in deltas:
+            key = (delta["user_id"], delta["product_id"])
+            self.rows[key] = self.rows.get(key, 0) + delta["quantity"]
+
+        self.applying.set()
+        await self.release.wait()
+
+
+@asynccontextmanager
+async def fake_session_pool():
+    yield SimpleNamespace(commit=lambda: asyncio.sleep(0))
+
+
+def test_reload_during_flush_counts_deltas_once(monkeypatch):
+    dao = FakeCartDAO()
+    monkeypatch.setattr(cart_buffer_module, "CartDAO", dao)
+
+    async def scenario():
+        buffer = CartWriteBehind(fake_session_pool)
+
+        for _ in range(3):
+            await buffer.increment(None, 1, 10)
+
+        flush = asyncio.create_task(buffer.flush())
+        await dao.applying.wait()
+
+        buffer._carts.clear()
+        reload = asyncio.create_task(buffer.get_summary(None, 1, 1, SimpleNamespace(get_product=lambda _: None)))
+        await asyncio.sleep(0)
+
+        dao.release.set()
+        await asyncio.gather(flush, reload)
+
+        return await buffer._get_cart(None, 1)
+
+    assert asyncio.run(scenario()) == {10: 3}
+
+
+def test_flush_writes_coalesced_deltas(run_with_database):
+    async def scenario(session_pool):
+        product_id = await seed_cart_product(session_pool)
+        buffer = CartWriteBehind(session_pool)
+
+        async with session_pool() as session:
+            for _ in range(5):
+                await buffer.increment(session, 1, product_id)
+
+            await buffer.decrement(session, 1, product_id)
+
+        written = await buffer.flush()
+
+        async with session_pool() as session:
+            carts = await CartDAO.db_get_user_carts(session, 1)
+
+        return written, [(cart.product_id, cart.quantity) for cart in carts], product_id
+
+    written, carts, product_id = run_with_database(scenario)
+
+    assert written == 1
+    assert carts == [(product_id, 4)]
+
+
+def test_failed_checkout_keeps_deltas(monkeypatch):
+    dao = FakeCartDAO()
+    monkeypatch.setattr(cart_buffer_module, "CartDAO", dao)
+
+    async def fail_apply_deltas(session, deltas):
+        raise ConnectionError("database is unavailable")
+
+    monkeypatch.setattr(dao, "db_apply_deltas", fail_apply_deltas)
+
+    buffer = CartWriteBehind(fake_session_pool)
+    monkeypatch.setattr(services, "cart_buffer", buffer)
+    monkeypatch.setattr(settings, "CART_WRITE_BEHIND", True)
+
+    async def scenario():
+        for _ in range(2):
+            await buffer.increment(None, 1, 10)
+
+        return await CartService.service_checkout(1)
+
+    assert asyncio.run(scenario()) is False
+    assert buffer._deltas == {(1, 10): 2}
+    assert buffer.failed_flushes == 1
@@ -0,0 +1,95 @@
+import asyncio
+from unittest.mock import MagicMock
+
+from app.models.dao import CartDAO
+from app.models.models import Category, Product, User
+
+from tests.conftest import RecordingSession
+
+PARALLEL_TAPS = 300
+
+
+async def seed_cart_product(session_pool):
+    async with session_pool() as session:
+        category = Category(name="Пицца")
+        session.add_all([category, User(telegram_id=1)])
+        await session.flush()
+
+        product = Product(name="Маргарита", description="", price=10, image="image", category_id=category.id)
+        session.add(product)
+        await session.commit()
+
+        return product.id
+
+
+async def increment(session_pool, product_id):
+    async with session_pool() as session:
+        quantity = await CartDAO.db_increment(session, 1, product_id)
+        await session.commit()
+
+        return quantity
+
+
+async def decrement(session_pool, product_id):
+    async with session_pool() as session:
+        result = await CartDAO.db_decrement(session, 1, product_id)
+        await session.commit()
+
+        return result
+
+
+def test_cart_statements_target_carts():
+    result = MagicMock()
+    session = RecordingSession(result)
+
+    async def scenario():
+        await CartDAO.db_increment(session, 1, 2)
+        await CartDAO.db_decrement(session, 1, 2)
+        await CartDAO.db_delete(session, 1, 2)
+
+    asyncio.run(scenario())
+
+    assert "INSERT INTO carts" in session.statements[0]
+    assert "ON CONFLICT ON CONSTRAINT uq_carts_user_id_product_id DO UPDATE" in session.statements[0]
+    assert "UPDATE carts" in session.statements[1] and "DELETE FROM carts" in session.statements[1]
+    assert session.statements[2].startswith("DELETE FROM carts")
+
+
+def test_parallel_increments_are_atomic(run_with_database):
+    async def scenario(session_pool):
+        product_id = await seed_cart_product(session_pool)
+        quantities = await asyncio.gather(*(increment(session_pool, product_id) for _ in range(PARALLEL_TAPS)))
+
+        async with session_pool() as session:
+            carts = await CartDAO.db_get_user_carts(session, 1)
+
+        return quantities, carts
+
+    quantities, carts = run_with_database(scenario)
+
+    assert sorted(quantities) == list(range(1, PARALLEL_TAPS + 1))
+    assert len(carts) == 1 and carts[0].quantity == PARALLEL_TAPS
+
+
+def test_parallel_decrements_delete_line_once(run_with_database):
+    async def scenario(session_pool):
+        product_id = await seed_cart_product(session_pool)
+
+        for _ in range(PARALLEL_TAPS):
+            await increment(session_pool, product_id)
+
+        results = await asyncio.gather(*(decrement(session_pool, product_id) for _ in range(PARALLEL_TAPS + 50)))
+
+        async with session_pool() as session:
+            carts = await CartDAO.db_get_user_carts(session, 1)
+
+        return results, carts
+
+    results, carts = run_with_database(scenario)
+
+    remaining = sorted(quantity for quantity, _ in results if quantity is not None)
+    deleted = [deleted_id for _, deleted_id in results if deleted_id is not None]
+
+    assert remaining == list(range(1, PARALLEL_TAPS))
+    assert len(deleted) == 1
+    assert not carts
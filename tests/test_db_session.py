@@ -0,0 +1,25 @@
+from sqlalchemy import text
+
+from app.middlewares.db import DataBaseSession
+
+
+def test_only_updates_that_check_out_a_connection_are_counted(run_with_database):
+    async def idle(event, data):
+        pass
+
+    async def query(event, data):
+        await data["session"].execute(text("SELECT 1"))
+
+    async def commit(event, data):
+        await data["session"].execute(text("SELECT 1"))
+        await data["session"].commit()
+
+    async def scenario(session_pool):
+        middleware = DataBaseSession(session_pool)
+
+        for handler in (idle, query, commit, idle):
+            await middleware(handler, None, {})
+
+        return middleware.updates_total, middleware.updates_without_connection
+
+    assert run_with_database(scenario) == (4, 2)
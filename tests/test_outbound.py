@@ -0,0 +1,77 @@
+import asyncio
+import socket
+import time
+
+from aiogram import Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.methods import SendMessage
+
+from app.middlewares.outbound import OutboundScheduler
+from benchmarks.fake_telegram import FakeTelegram
+
+
+def get_free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def test_fractional_global_rate_does_not_block_forever():
+    scheduler = OutboundScheduler()
+    scheduler.set_global_rate(0.5)
+    sent = []
+
+    async def make_request(bot, method):
+        sent.append(method.text)
+        return True
+
+    async def scenario():
+        bot = Bot("123456:test")
+        await asyncio.wait_for(scheduler(make_request, bot, SendMessage(chat_id=1, text="hello")), 1)
+        await bot.session.close()
+
+    asyncio.run(scenario())
+
+    assert sent == ["hello"]
+    assert scheduler._global.capacity == 1
+
+
+def test_retry_after_pauses_chat_and_global_limiters():
+    scheduler = OutboundScheduler(global_rate=30)
+    telegram = FakeTelegram()
+    telegram.flood(chat_id=1, retry_after=1)
+    timings = {}
+
+    async def send(bot: Bot, chat_id: int):
+        await bot.send_message(chat_id, "hello")
+        timings[chat_id] = time.monotonic()
+
+    async def scenario():
+        url = await telegram.start(port=get_free_port())
+        bot = Bot("123456:test", session=AiohttpSession(api=TelegramAPIServer.from_base(url)))
+        bot.session.middleware(scheduler)
+
+        try:
+            started_at = time.monotonic()
+            first = asyncio.create_task(send(bot, 1))
+
+            while not telegram.calls.get("sendmessage"):
+                await asyncio.sleep(0.01)
+
+            await asyncio.sleep(0.1)
+            await send(bot, 2)
+            await first
+
+            return started_at
+        finally:
+            await bot.session.close()
+            await telegram.stop()
+
+    started_at = asyncio.run(scenario())
+
+    assert scheduler.retries == 1
+    assert telegram.calls["sendmessage"] == 3
+    assert telegram.replies == 2
+    assert timings[1] - started_at >= 1
+    assert timings[2] - started_at >= 1
@@ -0,0 +1,25 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select
+
+from app.models.models import Product
+from app.utils.paginator import QueryPaginator
+from tests.conftest import RecordingSession
+
+
+class EmptyResult:
+    def all(self):
+        return []
+
+
+@pytest.mark.parametrize("page", [0, -5])
+def test_query_paginator_clamps_page(page):
+    session = RecordingSession(EmptyResult())
+    paginator = QueryPaginator(select(Product).order_by(Product.id), page=page)
+
+    asyncio.run(paginator.fetch(session))
+
+    assert paginator.page == 1
+    assert paginator.len == 0
+    assert len(session.statements) == 1
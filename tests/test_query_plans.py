@@ -0,0 +1,127 @@
+import json
+
+from sqlalchemy import event, text
+
+from app.models.dao import CartDAO, ProductDAO, UserDAO, FSMRecordDAO
+
+USERS = 100_000
+PRODUCTS = 10_000
+CATEGORIES = 50
+CARTS_PER_USER = 2
+
+BOT_ID = 123456
+
+HOT_TABLES = {"carts", "products", "users", "fsm_records"}
+
+
+async def seed(session_pool):
+    async with session_pool() as session:
+        await session.execute(text(
+            "INSERT INTO categories (name, created_at, updated_at) "
+            "SELECT 'category ' || n, now(), now() FROM generate_series(1, :count) AS n"
+        ), {"count": CATEGORIES})
+        await session.execute(text(
+            "INSERT INTO products (name, description, price, image, category_id, created_at, updated_at) "
+            "SELECT 'product ' || n, '', 10, 'image', (n - 1) / :per_category + 1, now(), now() "
+            "FROM generate_series(1, :count) AS n"
+        ), {"count": PRODUCTS, "per_category": PRODUCTS // CATEGORIES})
+        await session.execute(text(
+            "INSERT INTO users (telegram_id, created_at, updated_at) "
+            "SELECT n, now(), now() FROM generate_series(1, :count) AS n"
+        ), {"count": USERS})
+        await session.execute(text(
+            "INSERT INTO carts (user_id, product_id, quantity, created_at, updated_at) "
+            "SELECT user_id, ((user_id * 7 + k) % :products) + 1, 1, now(), now() "
+            "FROM generate_series(1, :users) AS user_id, generate_series(1, :per_user) AS k"
+        ), {"users": USERS, "products": PRODUCTS, "per_user": CARTS_PER_USER})
+        await session.execute(text(
+            "INSERT INTO fsm_records (bot_id, chat_id, user_id, thread_id, destiny, state, data, created_at, updated_at) "
+            "SELECT :bot_id, n, n, 0, 'default', NULL, '{}', now(), now() FROM generate_series(1, :count) AS n"
+        ), {"bot_id": BOT_ID, "count": USERS})
+        await session.commit()
+
+    async with session_pool() as session:
+        connection = await session.connection()
+        await connection.exec_driver_sql("ANALYZE")
+        await session.commit()
+
+
+def find_full_scans(plan: dict) -> list[str]:
+    scans = []
+
+    if plan.get("Relation Name") in HOT_TABLES:
+        node_type = plan.get("Node Type")
+
+        if node_type == "Seq Scan" or (node_type in ("Index Scan", "Index Only Scan") and "Index Cond" not in plan):
+            scans.append(f"{node_type} on {plan['Relation Name']}")
+
+    for child in plan.get("Plans", []):
+        scans.extend(find_full_scans(child))
+
+    return scans
+
+
+async def explain(session_pool, call) -> dict[str, list[str]]:
+    async with session_pool() as session:
+        connection = await session.connection()
+        statements = []
+
+        def capture(conn, cursor, statement, parameters, context, executemany):
+            statements.append((statement, parameters, executemany))
+
+        event.listen(connection.sync_connection, "before_cursor_execute", capture)
+
+        try:
+            await call(session)
+        finally:
+            event.remove(connection.sync_connection, "before_cursor_execute", capture)
+
+        await session.rollback()
+
+        connection = await session.connection()
+        plans = {}
+
+        for statement, parameters, executemany in statements:
+            if executemany:
+                parameters = parameters[0]
+
+            result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", tuple(parameters))
+            plan = result.scalar_one()
+            plans[statement] = find_full_scans((json.loads(plan) if isinstance(plan, str) else plan)[0]["Plan"])
+
+        await session.rollback()
+
+        return plans
+
+
+def test_hot_queries_use_indexes(run_with_database):
+    user_id = USERS // 2
+    product_id = (user_id * 7 + 1) % PRODUCTS + 1
+
+    calls = {
+        "db_get_cart_summary": lambda session: CartDAO.db_get_cart_summary(session, user_id, page=1),
+        "db_get_products_page": lambda session: ProductDAO.db_get_products_page(session, 7, page=3),
+        "db_increment": lambda session: CartDAO.db_increment(session, user_id, product_id),
+        "db_decrement": lambda session: CartDAO.db_decrement(session, user_id, product_id),
+        "db_delete": lambda session: CartDAO.db_delete(session, user_id, product_id),
+        "db_get_user_carts": lambda session: CartDAO.db_get_user_carts(session, user_id),
+        "db_apply_deltas": lambda session: CartDAO.db_apply_deltas(session, [
+            {"user_id": user_id, "product_id": product_id, "quantity": 1},
+            {"user_id": user_id, "product_id": product_id % PRODUCTS + 1, "quantity": -1}
+        ]),
+        "db_add_if_not_exists": lambda session: UserDAO.db_add_if_not_exists(session, telegram_id=USERS + 1),
+        "db_get_record": lambda session: FSMRecordDAO.db_get_record(session, (BOT_ID, user_id, user_id, 0, "default")),
+        "get_one": lambda session: ProductDAO.get_one(session, id=product_id)
+    }
+
+    async def scenario(session_pool):
+        await seed(session_pool)
+        return {name: await explain(session_pool, call) for name, call in calls.items()}
+
+    results = run_with_database(scenario)
+
+    for name, plans in results.items():
+        assert plans, f"{name} ran no statements"
+
+        for statement, scans in plans.items():
+            assert not scans, f"{name} runs a full scan {scans}:\n{statement}"
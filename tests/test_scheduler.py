@@ -0,0 +1,102 @@
+import asyncio
+import datetime
+
+from aiogram import Bot, Dispatcher, Router, F
+from aiogram.filters import StateFilter
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import State, StatesGroup
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.types import Update, Message, Chat, User, ErrorEvent
+
+from app.middlewares.scheduler import UpdateScheduler
+
+
+class Steps(StatesGroup):
+    a = State()
+    b = State()
+
+
+def make_update(update_id: int, text: str) -> Update:
+    return Update(
+        update_id=update_id,
+        message=Message(
+            message_id=update_id,
+            date=datetime.datetime.now(),
+            chat=Chat(id=1, type="private"),
+            from_user=User(id=1, is_bot=False, first_name="Admin"),
+            text=text
+        )
+    )
+
+
+def test_fsm_state_is_loaded_inside_user_lock():
+    handled = []
+    router = Router()
+
+    @router.message(StateFilter(None), F.text == "start")
+    async def start(message: Message, state: FSMContext):
+        handled.append("none")
+        await asyncio.sleep(0.01)
+        await state.set_state(Steps.a)
+
+    @router.message(Steps.a)
+    async def step_a(message: Message, state: FSMContext):
+        handled.append("a")
+        await state.set_state(Steps.b)
+
+    @router.message(Steps.b)
+    async def step_b(message: Message, state: FSMContext):
+        handled.append("b")
+        await state.clear()
+
+    dispatcher = Dispatcher()
+    dispatcher.include_router(router)
+
+    scheduler = UpdateScheduler(max_concurrency=4)
+    scheduler.install(dispatcher)
+
+    async def scenario():
+        bot = Bot("123456:test")
+
+        for update_id, text in enumerate(("start", "first", "second")):
+            await dispatcher.feed_update(bot, make_update(update_id, text))
+
+        await scheduler.drain()
+        await bot.session.close()
+
+    asyncio.run(scenario())
+
+    assert handled == ["none", "a", "b"]
+
+
+def test_handler_errors_reach_dispatcher_error_handlers():
+    errors = []
+    responses = []
+    router = Router()
+
+    @router.message()
+    async def fail(message: Message):
+        raise ValueError(message.text)
+
+    dispatcher = Dispatcher()
+    dispatcher.include_router(router)
+
+    @dispatcher.errors()
+    async def on_error(event: ErrorEvent):
+        errors.append((event.update.update_id, repr(event.exception)))
+
+    scheduler = UpdateScheduler(max_concurrency=4)
+    scheduler.install(dispatcher)
+
+    async def scenario():
+        bot = Bot("123456:test")
+
+        responses.append(await dispatcher.feed_update(bot, make_update(7, "boom")))
+
+        await scheduler.drain()
+        await bot.session.close()
+
+    asyncio.run(scenario())
+
+    assert responses[0] is not UNHANDLED
+    assert errors == [(7, "ValueError('boom')")]
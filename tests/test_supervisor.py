@@ -0,0 +1,131 @@
+import asyncio
+import multiprocessing
+from types import SimpleNamespace
+
+import pytest
+
+from app import supervisor
+from app.models.services import AdminService
+from app.supervisor import Worker, get_shard_key, merge_stats
+
+
+class FakeDispatcher:
+    def __init__(self):
+        self.updates = []
+        self.workflow_data = {}
+
+    def __setitem__(self, key, value):
+        self.workflow_data[key] = value
+
+    async def emit_startup(self, **kwargs):
+        pass
+
+    async def emit_shutdown(self, **kwargs):
+        pass
+
+    async def feed_raw_update(self, bot, update):
+        self.updates.append(update["update_id"])
+
+
+@pytest.fixture
+def worker_env(monkeypatch):
+    dispatcher = FakeDispatcher()
+    applied = []
+
+    async def close():
+        pass
+
+    async def apply_invalidation(self, kind):
+        supervisor._remote_invalidation.set(True)
+        applied.append(kind)
+        self.publish_invalidation(kind)
+
+    monkeypatch.setattr(supervisor, "dp", dispatcher)
+    monkeypatch.setattr(supervisor, "bot", SimpleNamespace(session=SimpleNamespace(close=close)))
+    monkeypatch.setattr(supervisor, "setup_dispatcher", lambda: None)
+    monkeypatch.setattr(supervisor, "collect_stats", lambda: {"updates": {"processed": 1}})
+    monkeypatch.setattr(Worker, "apply_invalidation", apply_invalidation)
+    monkeypatch.setattr(supervisor.outbound, "_global", supervisor.outbound._global)
+    monkeypatch.setattr(AdminService, "_invalidation_hooks", [])
+
+    return dispatcher, applied
+
+
+def drain(events: multiprocessing.Queue) -> list:
+    messages = []
+
+    while True:
+        try:
+            messages.append(events.get(timeout=0.2))
+        except Exception:
+            return messages
+
+
+def test_get_shard_key_prefers_sender():
+    assert get_shard_key({"update_id": 5, "message": {"from": {"id": 42}, "chat": {"id": -1}}}) == 42
+    assert get_shard_key({"update_id": 6, "my_chat_member": {"chat": {"id": -7}}}) == -7
+    assert get_shard_key({"update_id": 9, "poll": {"id": "x"}}) == 9
+
+
+def test_merge_stats():
+    merged = merge_stats([
+        {"processed": 1, "max_pending_seen": 3, "latency": {"avg": 1, "count": 2}},
+        {"processed": 2, "max_pending_seen": 5, "latency": {"avg": 3, "count": 1}}
+    ])
+
+    assert merged == {"processed": 3, "max_pending_seen": 5, "latency": {"avg": 2, "count": 3}}
+
+
+def test_worker_feeds_updates_and_does_not_echo_remote_invalidations(worker_env):
+    dispatcher, applied = worker_env
+    context = multiprocessing.get_context("spawn")
+    updates, events = context.Queue(), context.Queue()
+
+    for update_id in range(3):
+        updates.put(("update", {"update_id": update_id}))
+
+    updates.put(("invalidate", "admins"))
+    updates.put(None)
+
+    worker = Worker(0, 4, updates, events)
+    asyncio.run(worker.run())
+
+    assert dispatcher.updates == [0, 1, 2]
+    assert dispatcher.workflow_data["worker"] == "1/4"
+    assert applied == ["admins"]
+    assert supervisor.outbound._global.rate == supervisor.settings.OUTBOUND_GLOBAL_RATE / 4
+    assert [message[0] for message in drain(events)] == ["stats"]
+
+
+def test_admin_changes_are_published(worker_env, monkeypatch):
+    context = multiprocessing.get_context("spawn")
+    events = context.Queue()
+    worker = Worker(1, 2, context.Queue(), events)
+    AdminService.service_add_invalidation_hook(lambda: worker.publish_invalidation("admins"))
+
+    class FakeSession:
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *args):
+            pass
+
+        async def commit(self):
+            pass
+
+    async def replace_chat_admins(session, chat_id, user_ids):
+        pass
+
+    members = [SimpleNamespace(status="administrator", user=SimpleNamespace(id=10))]
+    bot = SimpleNamespace(get_chat_administrators=lambda chat_id: asyncio.sleep(0, members))
+
+    monkeypatch.setattr("app.models.services.async_session_maker", FakeSession)
+    monkeypatch.setattr("app.models.services.ChatAdminDAO.db_replace_chat_admins", replace_chat_admins)
+    monkeypatch.setattr(AdminService, "_chats", {})
+    monkeypatch.setattr(AdminService, "_admins", frozenset())
+
+    asyncio.run(AdminService._refresh_chat(bot, -100))
+    asyncio.run(AdminService._refresh_chat(bot, -100))
+
+    assert drain(events) == [("invalidate", 1, "admins")]
+    assert AdminService.service_is_admin(10, -100)
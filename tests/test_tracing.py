@@ -0,0 +1,86 @@
+import asyncio
+import datetime
+
+import pytest
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update, Message, Chat, User
+from sqlalchemy import text
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.middlewares.scheduler import UpdateScheduler
+from app.middlewares.tracing import UpdateTracer, UpdateTrace, _trace
+
+
+def make_update(update_id: int, user_id: int) -> Update:
+    return Update(
+        update_id=update_id,
+        message=Message(
+            message_id=update_id,
+            date=datetime.datetime.now(),
+            chat=Chat(id=user_id, type="private"),
+            from_user=User(id=user_id, is_bot=False, first_name="User"),
+            text="text"
+        )
+    )
+
+
+def test_queue_wait_is_reported_separately():
+    dispatcher = Dispatcher()
+
+    @dispatcher.message()
+    async def slow(message: Message):
+        await asyncio.sleep(0.05)
+
+    scheduler = UpdateScheduler(max_concurrency=1)
+    scheduler.install(dispatcher)
+
+    tracer = UpdateTracer(slow_threshold=10)
+    tracer.instrument_dispatcher(dispatcher)
+
+    async def scenario():
+        bot = Bot("123456:test")
+
+        for user_id in (1, 2):
+            await dispatcher.feed_update(bot, make_update(user_id, user_id))
+
+        await scheduler.drain()
+        await bot.session.close()
+
+    asyncio.run(scenario())
+
+    stats = tracer.handler_stats()["slow"]
+
+    assert stats["count"] == 2
+    assert stats["p99"] < 0.09
+    assert tracer.stats()["max_queue_wait"] >= 0.04
+
+
+def test_failed_statement_is_traced(database_url):
+    tracer = UpdateTracer()
+
+    async def scenario():
+        engine = create_async_engine(database_url, pool_size=1, max_overflow=0)
+        tracer.instrument_engine(engine)
+        trace = UpdateTrace()
+        token = _trace.set(trace)
+
+        try:
+            async with engine.connect() as connection:
+                with pytest.raises(DBAPIError):
+                    await connection.execute(text("SELECT 1 / 0"))
+
+                await connection.rollback()
+                await connection.execute(text("SELECT 1"))
+
+                info = dict(connection.sync_connection.info)
+        finally:
+            _trace.reset(token)
+            await engine.dispose()
+
+        return trace, info
+
+    trace, info = asyncio.run(scenario())
+
+    assert trace.db_queries == 2
+    assert "trace_started_at" not in info
@@ -0,0 +1,66 @@
+import asyncio
+
+import pytest
+
+from app import main
+from app.config import settings
+from app.models import services
+from app.models.services import UserService
+
+
+class FakeSession:
+    def __init__(self):
+        self.commits = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
+
+    async def commit(self):
+        self.commits += 1
+
+
+@pytest.fixture
+def profiles_env(monkeypatch):
+    updates = []
+
+    async def db_update_profiles(session, profiles):
+        updates.append(profiles)
+
+    monkeypatch.setattr(UserService, "_pending_profiles", {1: {"first_name": "Ann", "last_name": None}})
+    monkeypatch.setattr(services.UserDAO, "db_update_profiles", db_update_profiles)
+    monkeypatch.setattr(settings, "PROFILES_FLUSH_INTERVAL", 0.01)
+    monkeypatch.setattr(main, "async_session_maker", FakeSession)
+
+    return updates
+
+
+def run_flush_task(seconds: float):
+    async def scenario():
+        task = asyncio.create_task(main.flush_user_profiles())
+        await asyncio.sleep(seconds)
+        task.cancel()
+
+    asyncio.run(scenario())
+
+
+def test_pending_profiles_are_flushed_on_timer(profiles_env):
+    run_flush_task(0.05)
+
+    assert profiles_env == [[{"telegram_id": 1, "first_name": "Ann", "last_name": None}]]
+    assert UserService._pending_profiles == {}
+
+
+def test_failed_flush_keeps_profiles_pending(monkeypatch):
+    async def db_update_profiles(session, profiles):
+        raise RuntimeError("database is down")
+
+    monkeypatch.setattr(UserService, "_pending_profiles", {1: {"first_name": "Ann", "last_name": None}})
+    monkeypatch.setattr(services.UserDAO, "db_update_profiles", db_update_profiles)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(UserService.service_flush_profiles(FakeSession()))
+
+    assert UserService._pending_profiles == {1: {"first_name": "Ann", "last_name": None}}